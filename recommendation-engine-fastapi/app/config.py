@@ -8,8 +8,36 @@ class Settings(BaseSettings):
     CHROMA_PORT: int = 8000
     CHROMA_COLLECTION: str = "course_embeddings"
     
+    # Vector store backend: "chroma" (remote ChromaDB) or "numpy" (in-process exact search)
+    VECTOR_BACKEND: str = "chroma"
+    
     # Model settings
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "torch"  # "torch" (SentenceTransformer) or "onnx" (onnxruntime)
+    EMBEDDING_ONNX_QUANTIZE: bool = False  # Use a dynamically int8-quantized ONNX model
+    EMBEDDING_ONNX_MIN_PARITY: float = 0.99  # Lowest cosine vs. torch accepted for a fresh export
+    ONNX_MODEL_DIR: str = ""  # Defaults to data/onnx/<model name>
+    EMBEDDING_WORKERS: int = 0  # Embedding subprocesses; 0 encodes inside the API process
+    EMBEDDING_WORKER_THREADS: int = 1  # Inference threads per embedding subprocess
+    EMBEDDING_WORKER_MAX_BATCH: int = 64  # Texts per worker task (sizes each shared-memory buffer)
+    EMBEDDING_WORKER_START_TIMEOUT: float = 300.0  # Seconds to wait for workers to load the model
+    EMBEDDING_BATCH_MAX_SIZE: int = 32  # Most concurrent queries encoded in one call
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0  # Longest a query waits for others to join its batch
+    TOPIC_SIMILARITY_THRESHOLD: float = 0.4  # Lowest cosine for a query to be tagged with a skill category
+    NLP_BATCH_MAX_SIZE: int = 32  # Most concurrent intent parses run through one nlp.pipe call
+    NLP_BATCH_MAX_WAIT_MS: float = 5.0  # Longest a parse waits for others to join its batch
+    
+    # Ingestion settings
+    INGESTION_BATCH_SIZE: int = 64  # Courses encoded per model call during ingestion
+    INGESTION_QUEUE_BATCHES: int = 4  # Batches buffered between ingestion pipeline stages
+    INGESTION_WORKERS: int = 2  # Threads reserved for blocking ingestion work
+    INGESTION_JOB_HISTORY: int = 20  # Finished ingestion jobs kept for the status endpoint
+    PDF_EXTRACT_WORKERS: int = 4  # Processes extracting PDF pages; 1 extracts in-process
+    PDF_PAGES_PER_TASK: int = 8  # Pages handed to an extraction process at a time
+    SECTION_PROBE_PAGES: int = 20  # Leading catalog pages searched for a course boundary pattern
+    SNAPSHOT_EMBEDDING_DTYPE: str = "float32"  # Processed catalog snapshot storage: "float32" or "float16"
+    SNAPSHOT_PAGE_SIZE: int = 512  # Embeddings fetched from the store and written to the snapshot at a time
+    SNAPSHOT_VERIFY_ON_LOAD: bool = False  # Checksum the whole snapshot at startup instead of only checking its shape
     
     # Application settings
     DEBUG: bool = True
@@ -24,6 +52,14 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_REQUESTS: int = 100
     REQUEST_TIMEOUT: int = 30
     MODEL_CACHE_SIZE: int = 1000
+    INTENT_CACHE_SIZE: int = 1000  # Parsed intents kept per worker; 0 disables the cache
+    INTENT_CACHE_TTL_SECONDS: float = 600.0
+    RESPONSE_CACHE_SIZE: int = 500  # Finished recommendation responses kept per worker; 0 disables the cache
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_NEGATIVE_TTL_SECONDS: float = 30.0  # Lifetime of cached empty or fallback-only responses
+    CHROMA_POOL_SIZE: int = 8  # Worker threads dedicated to blocking ChromaDB calls
+    CHROMA_CALL_TIMEOUT: float = 10.0  # Seconds before a single ChromaDB call is abandoned
+    CATALOG_REFRESH_INTERVAL: float = 30.0  # Seconds between catalog count reconciliations; 0 disables
     
     # Health check settings
     HEALTH_CHECK_INTERVAL: int = 30
@@ -1,7 +1,8 @@
 import os
 import time
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
@@ -13,6 +14,8 @@ from .services.model_service import model_service
 from .services.vector_store import vector_store
 from .services.recommendation_service import recommendation_service
 from .services.data_ingestion import data_ingestion_service
+from .services.ingestion_jobs import ingestion_jobs, IngestionInProgressError, JobStatus
+from .services.embedding_pool import embedding_pool
 from .models.recommendation import (
     RecommendationRequest, 
     RecommendationResponse,
@@ -63,9 +66,16 @@ class ErrorResponse(BaseModel):
 # ------------ Startup Event ------------
 @app.on_event("startup")
 async def startup_event():
-    """Initialize services on application startup."""
-    logger.info("Starting up Skillyug Recommendation Engine...")
+    """Start warming up services in the background.
     
+    Loading models takes a while, so the server starts accepting connections
+    right away and /health reports "loading" until warm-up has finished.
+    """
+    logger.info("Starting up Skillyug Recommendation Engine...")
+    app.state.warmup_task = asyncio.create_task(warm_up_services())
+
+async def warm_up_services():
+    """Initialize services and auto-load course data."""
     try:
         # Initialize model service
         logger.info("Initializing model service...")
@@ -82,11 +92,10 @@ async def startup_event():
         # Auto-load course data if vector store is empty and auto-load is enabled
         if settings.AUTO_LOAD_COURSES:
             logger.info("Checking if course data needs to be loaded...")
-            collection_count = await vector_store.get_collection_count()
+            collection_count = vector_store.catalog_count
             if collection_count == 0:
                 logger.info("Vector store is empty, automatically loading course data...")
                 try:
-                    import os
                     # Try configured path first, then fallback to relative path
                     courses_json_path = settings.COURSES_JSON_PATH
                     if not os.path.exists(courses_json_path):
@@ -94,9 +103,14 @@ async def startup_event():
                     
                     if os.path.exists(courses_json_path):
                         logger.info(f"Loading courses from {courses_json_path}")
-                        await data_ingestion_service.process_json_catalog(courses_json_path)
-                        new_count = await vector_store.get_collection_count()
-                        logger.info(f"Course data loaded successfully! Vector store now has {new_count} documents")
+                        job = ingestion_jobs.start("json", courses_json_path)
+                        # A job cancelled through the API must not abort the rest of the warm-up
+                        await asyncio.gather(job.task, return_exceptions=True)
+                        if job.status == JobStatus.COMPLETED:
+                            new_count = vector_store.catalog_count
+                            logger.info(f"Course data loaded successfully! Vector store now has {new_count} documents")
+                        else:
+                            logger.warning(f"Course auto-load job {job.id} {job.status.value}")
                     else:
                         logger.warning(f"Course data file not found at {courses_json_path}")
                         logger.info("To load course data, please ensure courses.json exists or use the /api/ingest-json-catalog endpoint")
@@ -113,6 +127,15 @@ async def startup_event():
         logger.error(f"Failed to initialize services: {e}")
         # Don't raise here to allow the app to start, but health check will reflect the error
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release service resources on application shutdown."""
+    await ingestion_jobs.shutdown()
+    await vector_store.stop_refresher()
+    vector_store.executor.shutdown()
+    data_ingestion_service.executor.shutdown()
+    embedding_pool.shutdown()
+
 # ------------ Health Check ------------
 @app.get(
     "/health", 
@@ -120,21 +143,43 @@ async def startup_event():
     tags=["System"],
     responses={
         200: {"description": "Service is healthy"},
-        503: {"description": "Service is degraded"}
+        503: {"description": "Service is still loading or degraded"}
     }
 )
 async def health():
     """Health check endpoint to verify the service is running."""
+    warmup_task = getattr(app.state, "warmup_task", None)
+    warming_up = warmup_task is not None and not warmup_task.done()
+    
+    models_status = {
+        "ready": "ready",
+        "loading": "loading",
+        "not_loaded": "loading" if warming_up else "unavailable",
+        "failed": "unavailable"
+    }[model_service.status.value]
+    if vector_store.is_initialized:
+        vector_store_status = "ready"
+    else:
+        vector_store_status = "loading" if warming_up else "unavailable"
+    
     services_status = {
-        "models": "ready" if model_service.is_initialized else "unavailable",
-        "vector_store": "ready" if vector_store.is_initialized else "unavailable"
+        "models": models_status,
+        "vector_store": vector_store_status
     }
     
     is_healthy = all(status == "ready" for status in services_status.values())
+    is_loading = any(status == "loading" for status in services_status.values())
     status_code = status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE
     
+    if is_healthy:
+        overall_status = "healthy"
+    elif is_loading:
+        overall_status = "loading"
+    else:
+        overall_status = "degraded"
+    
     response = {
-        "status": "healthy" if is_healthy else "degraded",
+        "status": overall_status,
         "services": services_status,
         "uptime_seconds": time.time() - start_time,
         "timestamp": datetime.utcnow().isoformat(),
@@ -146,6 +191,22 @@ async def health():
         status_code=status_code
     )
 
+# ------------ Metrics ------------
+@app.get(
+    "/api/metrics",
+    response_model=Dict[str, Any],
+    tags=["System"]
+)
+async def metrics():
+    """Get runtime performance counters for the recommendation services."""
+    return {
+        "models": model_service.get_metrics(),
+        "vector_store": vector_store.get_metrics(),
+        "recommendations": recommendation_service.get_metrics(),
+        "ingestion": ingestion_jobs.get_metrics(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 # ------------ Recommendation Endpoint ------------
 @app.post(
     "/api/recommendations", 
@@ -184,8 +245,7 @@ async def get_recommendations(request: RecommendationRequest):
             }
         
         # Check if we have course data
-        collection_count = await vector_store.get_collection_count()
-        if collection_count == 0:
+        if vector_store.catalog_count == 0:
             return {
                 "success": False,
                 "error": "No course data available. The system is still initializing."
@@ -235,6 +295,7 @@ async def get_recommendations(request: RecommendationRequest):
                     "level": response.intent.level,
                     "keywords": response.intent.keywords,
                     "topics": response.intent.topics,
+                    "categories": response.intent.categories,
                     "intent_type": response.intent.intent_type
                 },
                 "match_type": response.match_type,
@@ -336,30 +397,53 @@ async def get_recommendations_backend_format(request_data: Dict[str, Any]):
                 "timestamp": datetime.utcnow().isoformat()
             }
         }
+def start_ingestion_job(source: str, path: str) -> Dict[str, Any]:
+    """Start an ingestion job, mapping a missing file or a running job to HTTP errors."""
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Catalog file not found at {path}"
+        )
+    
+    try:
+        job = ingestion_jobs.start(source, path)
+    except IngestionInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "job_id": e.job.id}
+        )
+    
+    return {
+        "success": True,
+        "message": "Course catalog ingestion started in background",
+        "job_id": job.id,
+        "status_url": f"/api/ingest/jobs/{job.id}",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.post(
     "/api/ingest-catalog",
     response_model=Dict[str, Any],
     tags=["Data Management"],
     responses={
         200: {"description": "Course catalog ingestion started"},
+        404: {"model": ErrorResponse, "description": "Catalog file not found"},
+        409: {"model": ErrorResponse, "description": "Another ingestion is already running"},
         500: {"model": ErrorResponse, "description": "Failed to start ingestion"}
     }
 )
-async def ingest_course_catalog(background_tasks: BackgroundTasks):
+async def ingest_course_catalog():
     """
     Manually trigger course catalog ingestion from PDF.
     This will process the course catalog PDF and update the vector store.
+    Returns a job id whose progress can be followed at /api/ingest/jobs/{job_id}.
     """
     try:
-        # Add background task to process the catalog
-        background_tasks.add_task(process_catalog_background)
-        
-        return {
-            "success": True,
-            "message": "Course catalog ingestion started in background",
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        pdf_path = os.path.join(os.path.dirname(__file__), '../data/course-catalog.pdf')
+        return start_ingestion_job("pdf", pdf_path)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start catalog ingestion: {e}")
         raise HTTPException(
@@ -367,72 +451,29 @@ async def ingest_course_catalog(background_tasks: BackgroundTasks):
             detail=f"Failed to start catalog ingestion: {str(e)}"
         )
 
-async def process_catalog_background():
-    """Background task to process the course catalog."""
-    try:
-        logger.info("Starting background catalog processing...")
-        
-        pdf_path = os.path.join(os.path.dirname(__file__), '../data/course-catalog.pdf')
-        
-        if os.path.exists(pdf_path):
-            courses = await data_ingestion_service.process_catalog(pdf_path)
-            
-            if courses:
-                await vector_store.add_courses(courses)
-                logger.info(f"Background task completed: processed {len(courses)} courses")
-            else:
-                logger.warning("Background task: no courses extracted from PDF")
-        else:
-            logger.warning(f"Background task: PDF not found at {pdf_path}")
-            
-    except Exception as e:
-        logger.error(f"Background catalog processing failed: {e}")
-
-async def process_json_catalog_background():
-    """Background task to process JSON catalog."""
-    try:
-        logger.info("Starting background JSON catalog processing...")
-        
-        json_path = os.path.join(os.path.dirname(__file__), '../data/courses.json')
-        
-        if os.path.exists(json_path):
-            courses = await data_ingestion_service.process_json_catalog(json_path)
-            
-            if courses:
-                await vector_store.add_courses(courses)
-                logger.info(f"Background task completed: processed {len(courses)} courses from JSON")
-            else:
-                logger.warning("Background task: no courses extracted from JSON")
-        else:
-            logger.warning(f"Background task: JSON not found at {json_path}")
-            
-    except Exception as e:
-        logger.error(f"Background JSON catalog processing failed: {e}")
-
 @app.post(
     "/api/ingest-json-catalog",
     response_model=Dict[str, Any],
     tags=["Data Management"],
     responses={
         200: {"description": "JSON course catalog ingestion started"},
+        404: {"model": ErrorResponse, "description": "Catalog file not found"},
+        409: {"model": ErrorResponse, "description": "Another ingestion is already running"},
         500: {"model": ErrorResponse, "description": "Failed to start ingestion"}
     }
 )
-async def ingest_json_course_catalog(background_tasks: BackgroundTasks):
+async def ingest_json_course_catalog():
     """
     Manually trigger course catalog ingestion from JSON file.
     This will process the courses.json file and update the vector store.
+    Returns a job id whose progress can be followed at /api/ingest/jobs/{job_id}.
     """
     try:
-        # Add background task to process the JSON catalog
-        background_tasks.add_task(process_json_catalog_background)
-        
-        return {
-            "success": True,
-            "message": "JSON course catalog ingestion started in background",
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        json_path = os.path.join(os.path.dirname(__file__), '../data/courses.json')
+        return start_ingestion_job("json", json_path)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start JSON catalog ingestion: {e}")
         raise HTTPException(
@@ -440,6 +481,65 @@ async def ingest_json_course_catalog(background_tasks: BackgroundTasks):
             detail=f"Failed to start JSON catalog ingestion: {str(e)}"
         )
 
+@app.get(
+    "/api/ingest/jobs",
+    response_model=Dict[str, Any],
+    tags=["Data Management"]
+)
+async def list_ingestion_jobs():
+    """List recent ingestion jobs, newest first."""
+    return {
+        "active_job": ingestion_jobs.active_job.id if ingestion_jobs.active_job else None,
+        "jobs": [job.to_dict() for job in ingestion_jobs.list_jobs()]
+    }
+
+@app.get(
+    "/api/ingest/jobs/{job_id}",
+    response_model=Dict[str, Any],
+    tags=["Data Management"],
+    responses={404: {"model": ErrorResponse, "description": "Unknown job id"}}
+)
+async def get_ingestion_job(job_id: str):
+    """
+    Get the status of an ingestion job: phase, courses parsed, embedded,
+    unchanged and written, throughput in courses/sec, and any errors.
+    """
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ingestion job {job_id} not found"
+        )
+    return job.to_dict()
+
+@app.post(
+    "/api/ingest/jobs/{job_id}/cancel",
+    response_model=Dict[str, Any],
+    tags=["Data Management"],
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown job id"},
+        409: {"model": ErrorResponse, "description": "Job has already finished"}
+    }
+)
+async def cancel_ingestion_job(job_id: str):
+    """Cancel a running ingestion job. Batches already written stay in the vector store."""
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ingestion job {job_id} not found"
+        )
+    if not ingestion_jobs.cancel(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Ingestion job {job_id} is already {job.status.value}"
+        )
+    return {
+        "success": True,
+        "message": f"Cancellation requested for ingestion job {job_id}",
+        "job_id": job_id
+    }
+
 # ------------ Vector Store Status Endpoint ------------
 @app.get(
     "/api/vector-store/status",
@@ -456,11 +556,10 @@ async def vector_store_status():
                 "message": "Vector store not initialized"
             }
         
-        count = vector_store.collection.count()
-        
         return {
             "initialized": True,
-            "document_count": count,
+            **vector_store.get_catalog_state(),
+            "backend": vector_store.backend,
             "collection_name": settings.CHROMA_COLLECTION,
             "chroma_host": settings.CHROMA_HOST,
             "chroma_port": settings.CHROMA_PORT
@@ -27,6 +27,7 @@ class UserIntent(BaseModel):
     level: Optional[str] = None
     keywords: List[str] = []
     topics: List[str] = []
+    categories: List[str] = []  # Skill categories, e.g. "Data Science"
     intent_type: Optional[str] = None  # e.g., "learn", "build", "explore"
 
 class RecommendationItem(BaseModel):
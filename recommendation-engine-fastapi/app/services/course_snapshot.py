@@ -0,0 +1,230 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "skillyug-course-snapshot"
+SNAPSHOT_VERSION = 1
+SUPPORTED_DTYPES = ("float32", "float16")
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), '../../data')
+SNAPSHOT_NAME = "processed_courses"
+
+# Rows copied per step when shrinking a preallocated matrix
+COMPACT_ROWS = 4096
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or of an unknown version."""
+
+def snapshot_paths(directory: Optional[str] = None, name: str = SNAPSHOT_NAME) -> Tuple[str, str]:
+    """Return the (embeddings, metadata) file paths of a snapshot."""
+    directory = directory or DEFAULT_SNAPSHOT_DIR
+    return (
+        os.path.join(directory, f"{name}.npy"),
+        os.path.join(directory, f"{name}.meta.json")
+    )
+
+def _file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SnapshotWriter:
+    """Write a snapshot a block of rows at a time.
+
+    The embeddings matrix is preallocated as a memory-mapped ``.npy`` of
+    ``capacity`` rows once the first block fixes its width, so the whole
+    matrix never has to be in memory. Blocks fill it in order; if fewer than
+    ``capacity`` rows arrive, :meth:`commit` copies the filled rows to a
+    right-sized file. Nothing replaces the current snapshot until then.
+
+    Args:
+        capacity: Most rows the snapshot will hold
+        directory: Target directory; defaults to the app's data directory
+        dtype: "float32" or "float16" storage for the embeddings
+    """
+
+    def __init__(self, capacity: int, directory: Optional[str] = None, dtype: str = "float32"):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported snapshot dtype {dtype!r}, expected one of {SUPPORTED_DTYPES}")
+
+        self.capacity = capacity
+        self.dtype = dtype
+        self.embeddings_path, self.meta_path = snapshot_paths(directory)
+        os.makedirs(os.path.dirname(self.embeddings_path), exist_ok=True)
+        self._tmp_embeddings_path = self.embeddings_path + '.tmp'
+        self._matrix: Optional[np.ndarray] = None
+        self._records: List[Dict[str, Any]] = []
+
+    def append(self, courses: List[Dict[str, Any]], embeddings: np.ndarray) -> None:
+        """Add courses and their embeddings, row ``i`` belonging to course ``i``."""
+        if len(courses) != len(embeddings):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(courses)} courses")
+        if not courses:
+            return
+
+        start = len(self._records)
+        if start + len(courses) > self.capacity:
+            raise ValueError(f"Snapshot capacity of {self.capacity} rows exceeded")
+        if self._matrix is None:
+            self._matrix = np.lib.format.open_memmap(
+                self._tmp_embeddings_path, mode='w+', dtype=self.dtype,
+                shape=(self.capacity, np.shape(embeddings)[1])
+            )
+
+        self._matrix[start:start + len(courses)] = embeddings
+        self._records.extend({k: v for k, v in course.items() if k != 'embedding'} for course in courses)
+
+    def commit(self) -> int:
+        """Write the metadata and swap both files in, the matrix first.
+
+        Returns:
+            Number of courses written
+        """
+        rows = len(self._records)
+        if self._matrix is None:
+            with open(self._tmp_embeddings_path, 'wb') as f:
+                np.save(f, np.zeros((0, 0), dtype=self.dtype))
+            shape = [0, 0]
+        else:
+            self._matrix.flush()
+            shape = [rows, self._matrix.shape[1]]
+            if rows < self.capacity:
+                self._compact(rows)
+            self._matrix = None
+
+        courses_line = json.dumps(self._records, separators=(',', ':'), ensure_ascii=False)
+        header = {
+            'format': SNAPSHOT_FORMAT,
+            'version': SNAPSHOT_VERSION,
+            'processed_at': datetime.utcnow().isoformat(),
+            'total_courses': rows,
+            'shape': shape,
+            'dtype': self.dtype,
+            'embeddings_sha256': _file_sha256(self._tmp_embeddings_path),
+            'courses_sha256': hashlib.sha256(courses_line.encode('utf-8')).hexdigest()
+        }
+
+        tmp_meta_path = self.meta_path + '.tmp'
+        with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, separators=(',', ':')) + '\n')
+            f.write(courses_line + '\n')
+
+        os.replace(self._tmp_embeddings_path, self.embeddings_path)
+        os.replace(tmp_meta_path, self.meta_path)
+        return rows
+
+    def abort(self) -> None:
+        """Drop the partly written matrix, leaving the current snapshot alone."""
+        self._matrix = None
+        if os.path.exists(self._tmp_embeddings_path):
+            os.remove(self._tmp_embeddings_path)
+
+    def _compact(self, rows: int) -> None:
+        """Replace the temporary matrix with a copy of its first ``rows`` rows."""
+        compact_path = self._tmp_embeddings_path + '.compact'
+        compact = np.lib.format.open_memmap(
+            compact_path, mode='w+', dtype=self.dtype, shape=(rows, self._matrix.shape[1])
+        )
+        for start in range(0, rows, COMPACT_ROWS):
+            end = min(start + COMPACT_ROWS, rows)
+            compact[start:end] = self._matrix[start:end]
+        compact.flush()
+        del compact
+        self._matrix = None
+        os.replace(compact_path, self._tmp_embeddings_path)
+
+def save_snapshot(
+    courses: List[Dict[str, Any]],
+    directory: Optional[str] = None,
+    dtype: str = "float32"
+) -> int:
+    """Write courses as an embeddings matrix plus a compact metadata file.
+
+    Embeddings go into one contiguous ``.npy`` matrix, row ``i`` belonging to
+    course ``i``. The metadata file holds a one-line header (format, version,
+    shape, dtype, checksums) followed by one line with the courses minus their
+    embeddings. Both files are written to temporary names and swapped in, the
+    matrix first, so a reader never sees a header for a half-written matrix.
+
+    Args:
+        courses: Courses with an ``embedding``; courses without one are skipped
+        directory: Target directory; defaults to the app's data directory
+        dtype: "float32" or "float16" storage for the embeddings
+
+    Returns:
+        Number of courses written
+    """
+    stored = [course for course in courses if course.get('embedding') is not None]
+    if len(stored) < len(courses):
+        logger.warning(f"Skipping {len(courses) - len(stored)} courses without embeddings in snapshot")
+
+    writer = SnapshotWriter(len(stored), directory, dtype)
+    try:
+        if stored:
+            writer.append(stored, np.asarray([course['embedding'] for course in stored], dtype=dtype))
+        return writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+def load_snapshot(
+    directory: Optional[str] = None,
+    mmap: bool = True,
+    verify: bool = False
+) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """Read a snapshot written by :func:`save_snapshot`.
+
+    The header and matrix shape are always checked. The checksums require
+    reading both files in full, which would defeat the memory map, so they
+    are only checked on request.
+
+    Args:
+        directory: Snapshot directory; defaults to the app's data directory
+        mmap: Memory-map the embeddings instead of reading them into memory
+        verify: Check both checksums before returning
+
+    Returns:
+        (courses without embeddings, embeddings matrix), aligned by row
+
+    Raises:
+        SnapshotError: If the snapshot is missing, corrupt or unsupported
+    """
+    embeddings_path, meta_path = snapshot_paths(directory)
+    if not os.path.exists(meta_path) or not os.path.exists(embeddings_path):
+        raise SnapshotError(f"No snapshot at {meta_path}")
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError as e:
+            raise SnapshotError(f"Unreadable snapshot header: {e}")
+        courses_line = f.readline().rstrip('\n')
+
+    if header.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"Not a course snapshot: {meta_path}")
+    if header.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')}")
+
+    if verify:
+        if hashlib.sha256(courses_line.encode('utf-8')).hexdigest() != header.get('courses_sha256'):
+            raise SnapshotError("Snapshot course metadata checksum mismatch")
+        if _file_sha256(embeddings_path) != header.get('embeddings_sha256'):
+            raise SnapshotError("Snapshot embeddings checksum mismatch")
+
+    courses = json.loads(courses_line)
+    embeddings = np.load(embeddings_path, mmap_mode='r' if mmap else None)
+
+    if list(embeddings.shape) != header.get('shape') or len(courses) != embeddings.shape[0]:
+        raise SnapshotError(
+            f"Snapshot shape {list(embeddings.shape)} does not match header {header.get('shape')}"
+        )
+
+    return courses, embeddings
@@ -1,69 +1,199 @@
 import os
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-import PyPDF2
-import pdfplumber
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Tuple, Union
 import re
 import json
-from datetime import datetime
-from sentence_transformers import SentenceTransformer
+import hashlib
+import itertools
+import threading
+from dataclasses import dataclass, field
+import numpy as np
+
+from .model_registry import model_registry
+from .vector_store import vector_store, SAMPLE_SOURCE
+from .course_snapshot import SnapshotWriter, load_snapshot, snapshot_paths, SnapshotError
+from .pdf_extraction import iter_pdf_pages
+from ..config import settings
+from ..utils.executor import BoundedExecutor
 
 logger = logging.getLogger(__name__)
 
+# Course fields stored as vector store metadata; editing any of them must
+# re-sync the course even when its embedding text is unchanged
+HASHED_METADATA_FIELDS = (
+    'title', 'level', 'category', 'price', 'rating',
+    'students_count', 'instructor', 'tags', 'features'
+)
+
+# Patterns that indicate course boundaries, most specific first
+COURSE_BOUNDARY_PATTERNS = [
+    r'(?=Course\s*\d+:)',  # "Course 1:", "Course 2:", etc.
+    r'(?=\d+\.\s+[A-Z])',  # "1. Python", "2. JavaScript", etc.
+    r'(?=\n[A-Z][^a-z\n]*(?:Course|Program|Training|Bootcamp))',  # All caps course titles
+    r'(?=\n\d+\.\s*[A-Z])',  # Numbered list items
+]
+
+# Section field patterns, compiled once
+TITLE_PREFIX_PATTERN = re.compile(r'^(\d+\.?\s*|Course\s*\d*:?\s*)', re.IGNORECASE)
+NUMBERED_LINE_PATTERN = re.compile(r'^\d+\.')
+
+PRICE_PATTERNS = [
+    re.compile(r'₹\s*(\d+(?:,\d+)*)', re.IGNORECASE),  # ₹1,299
+    re.compile(r'INR\s*(\d+(?:,\d+)*)', re.IGNORECASE),  # INR 1299
+    re.compile(r'Rs\.?\s*(\d+(?:,\d+)*)', re.IGNORECASE),  # Rs. 1299
+    re.compile(r'\$\s*(\d+(?:,\d+)*)', re.IGNORECASE),  # $99
+    re.compile(r'(\d+(?:,\d+)*)\s*(?:rupees|INR|₹)', re.IGNORECASE),  # 1299 rupees
+]
+
+DURATION_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:weeks?|months?|days?|hours?)', re.IGNORECASE),
+    re.compile(r'Duration:\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'Time:\s*([^\n]+)', re.IGNORECASE),
+]
+
+# Each pattern is paired with a lowercase marker the section must contain for
+# the pattern to match at all, so most sections skip most searches
+TOPIC_PATTERNS = [
+    (None, re.compile(r'[•·▪▫]\s*([^\n]+)')),  # Bullet points
+    ('.', re.compile(r'\d+\.\s*([^\n]+)')),  # Numbered items
+    ('topic', re.compile(r'Topics?:\s*([^\n]+)', re.IGNORECASE)),  # "Topics:" followed by list
+    ('module', re.compile(r'Modules?:\s*([^\n]+)', re.IGNORECASE)),  # "Modules:" followed by list
+]
+BULLET_CHARS = '•·▪▫'
+TOPIC_PREFIX_PATTERN = re.compile(r'^[•·▪▫\d\.\s-]+')
+
+FEATURE_LIST_PATTERNS = [
+    ('feature', re.compile(r'Features?:\s*([^\n]+)', re.IGNORECASE)),
+    ('benefit', re.compile(r'Benefits?:\s*([^\n]+)', re.IGNORECASE)),
+    ('include', re.compile(r'Includes?:\s*([^\n]+)', re.IGNORECASE)),
+]
+
+# Level markers in precedence order; matched as substrings, so "intro" also
+# catches "introduction"
+LEVEL_KEYWORDS = {
+    'beginner': ['beginner', 'basic', 'intro', 'foundation'],
+    'advanced': ['advanced', 'expert', 'master'],
+    'intermediate': ['intermediate', 'medium'],
+}
+
+# Common feature indicators
+FEATURE_KEYWORDS = [
+    'certificate', 'certification', 'hands-on', 'projects', 'mentorship',
+    'support', 'lifetime access', 'refund', 'bootcamp', 'workshop'
+]
+
+# Technology keywords, in tag order; matched as substrings, so "java" is also
+# a tag of JavaScript courses. Tags feed the content hash, so changing how
+# they match re-embeds the whole catalog on the next sync.
+TECH_KEYWORDS = [
+    'python', 'javascript', 'java', 'node.js', 'react', 'angular', 'vue',
+    'django', 'flask', 'spring', 'html', 'css', 'sql', 'mongodb',
+    'aws', 'azure', 'docker', 'kubernetes', 'git', 'api', 'rest',
+    'graphql', 'microservices', 'database', 'frontend', 'backend',
+    'fullstack', 'mobile', 'android', 'ios', 'machine learning',
+    'data science', 'artificial intelligence', 'blockchain', 'devops'
+]
+
+# Categories in priority order; matched as substrings like the level markers,
+# so overlapping terms ("react" and "react native") both count
+CATEGORY_KEYWORDS = {
+    'Programming': ['python', 'javascript', 'java', 'programming', 'coding', 'software'],
+    'Web Development': ['html', 'css', 'react', 'angular', 'vue', 'web', 'frontend', 'backend'],
+    'Data Science': ['data', 'analytics', 'machine learning', 'ai', 'statistics', 'pandas'],
+    'Mobile Development': ['android', 'ios', 'mobile', 'app development', 'flutter', 'react native'],
+    'Cloud & DevOps': ['aws', 'azure', 'cloud', 'docker', 'kubernetes', 'devops', 'ci/cd'],
+    'Business': ['management', 'business', 'marketing', 'strategy', 'entrepreneurship'],
+    'Design': ['ui', 'ux', 'design', 'figma', 'photoshop', 'graphics']
+}
+
+# Marks the end of the stream on an ingestion pipeline queue
+_PIPELINE_DONE = object()
+
+@dataclass
+class IngestionProgress:
+    """Live counters of one ingestion run."""
+    phase: str = "pending"
+    parsed: int = 0
+    unchanged: int = 0
+    embedded: int = 0
+    written: int = 0
+    deleted: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters plus elapsed time and throughput."""
+        elapsed = self.elapsed()
+        processed = self.unchanged + self.embedded
+        return {
+            'phase': self.phase,
+            'parsed': self.parsed,
+            'unchanged': self.unchanged,
+            'embedded': self.embedded,
+            'written': self.written,
+            'deleted': self.deleted,
+            'failed': self.failed,
+            'errors': list(self.errors),
+            'elapsed_seconds': elapsed,
+            'courses_per_second': processed / elapsed if elapsed > 0 else 0.0
+        }
+
 class DataIngestionService:
     """Service to ingest and process course catalog data."""
     
     def __init__(self):
         self.embedding_model = None
         self.course_data = []
+        self._init_lock = asyncio.Lock()
+        # Ingestion's blocking work gets its own threads so a large catalog
+        # can't occupy the default executor that request handling relies on
+        self.executor = BoundedExecutor("ingestion", settings.INGESTION_WORKERS)
         
     async def initialize(self):
         """Initialize the embedding model."""
-        try:
-            logger.info("Initializing embedding model for data ingestion...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Data ingestion service initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize data ingestion service: {e}")
-            raise
+        async with self._init_lock:
+            if self.embedding_model:
+                return
+            try:
+                logger.info("Initializing embedding model for data ingestion...")
+                self.embedding_model = await self.executor.run(model_registry.get_encoder)
+                logger.info("Data ingestion service initialized")
+            except Exception as e:
+                logger.error(f"Failed to initialize data ingestion service: {e}")
+                raise
+    
+    def iter_pdf_pages(self, pdf_path: str) -> Iterator[str]:
+        """Stream the text of a PDF page by page, extracted in parallel."""
+        return iter_pdf_pages(
+            pdf_path,
+            max_workers=settings.PDF_EXTRACT_WORKERS,
+            pages_per_task=settings.PDF_PAGES_PER_TASK
+        )
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text content from a PDF file."""
         try:
-            text_content = ""
-            
-            # Try with pdfplumber first (better for structured PDFs)
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
-            
-            if not text_content.strip():
-                # Fallback to PyPDF2
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        text_content += page.extract_text() + "\n"
-            
-            return text_content.strip()
+            return "\n".join(self.iter_pdf_pages(pdf_path)).strip()
             
         except Exception as e:
             logger.error(f"Failed to extract text from PDF {pdf_path}: {e}")
             return ""
     
-    def parse_course_catalog(self, text_content: str) -> List[Dict[str, Any]]:
-        """Parse course information from the extracted text."""
-        courses = []
+    def parse_course_catalog(self, content: Union[str, Iterable[str]]) -> List[Dict[str, Any]]:
+        """Parse course information from the extracted text.
         
+        Args:
+            content: The whole catalog text, or an iterable of page texts that
+                is consumed incrementally
+        """
         try:
-            # Split text into sections (assuming courses are separated by certain patterns)
-            course_sections = self._split_into_courses(text_content)
-            
-            for i, section in enumerate(course_sections):
-                course_info = self._extract_course_info(section, i)
-                if course_info:
-                    courses.append(course_info)
+            courses = list(self.iter_courses(content))
             
             logger.info(f"Parsed {len(courses)} courses from catalog")
             return courses
@@ -72,18 +202,63 @@ class DataIngestionService:
             logger.error(f"Failed to parse course catalog: {e}")
             return []
     
+    def iter_courses(
+        self,
+        content: Union[str, Iterable[str]],
+        progress: Optional[IngestionProgress] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield parsed courses one at a time as the catalog text is consumed.
+        
+        Non-empty sections that fail to parse are counted in ``progress.failed``.
+        Closing the returned generator also closes ``content`` if it can be
+        closed, so an abandoned PDF stream stops its extraction pool.
+        """
+        pages = [content] if isinstance(content, str) else content
+        
+        try:
+            for i, section in enumerate(self._iter_course_sections(pages)):
+                course_info = self._extract_course_info(section, i)
+                if course_info:
+                    yield course_info
+                elif section.strip() and progress is not None:
+                    progress.failed += 1
+        finally:
+            close = getattr(pages, 'close', None)
+            if close is not None:
+                close()
+    
+    def _iter_course_sections(self, pages: Iterable[str]) -> Iterator[str]:
+        """Yield course sections as soon as the following section has started.
+        
+        The boundary pattern is chosen like :meth:`_split_into_courses` does,
+        from the first ``SECTION_PROBE_PAGES`` pages rather than the whole
+        text, so for catalogs up to that length the sections are identical.
+        After the probe only the unfinished tail of the text is buffered; if
+        no pattern matched the probe, the paragraph heuristic is streamed
+        instead.
+        """
+        pages = iter(pages)
+        probe = "".join(page + "\n" for page in itertools.islice(pages, max(1, settings.SECTION_PROBE_PAGES))).lstrip()
+        chunks = itertools.chain([probe], (page + "\n" for page in pages))
+        
+        pattern = next((candidate for candidate in COURSE_BOUNDARY_PATTERNS if re.search(candidate, probe)), None)
+        if pattern is None:
+            yield from self._group_paragraphs(self._iter_paragraphs(chunks))
+            return
+        
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            *finished, buffer = re.split(pattern, buffer)
+            yield from (section.strip() for section in finished if section.strip())
+        
+        if buffer.strip():
+            yield buffer.strip()
+    
     def _split_into_courses(self, text: str) -> List[str]:
         """Split text into individual course sections."""
-        # Look for patterns that indicate course boundaries
-        patterns = [
-            r'(?=Course\s*\d+:)',  # "Course 1:", "Course 2:", etc.
-            r'(?=\d+\.\s+[A-Z])',  # "1. Python", "2. JavaScript", etc.
-            r'(?=\n[A-Z][^a-z\n]*(?:Course|Program|Training|Bootcamp))',  # All caps course titles
-            r'(?=\n\d+\.\s*[A-Z])',  # Numbered list items
-        ]
-        
         sections = []
-        for pattern in patterns:
+        for pattern in COURSE_BOUNDARY_PATTERNS:
             matches = re.split(pattern, text)
             if len(matches) > 1:
                 sections = [match.strip() for match in matches if match.strip()]
@@ -97,28 +272,41 @@ class DataIngestionService:
     
     def _fallback_split(self, text: str) -> List[str]:
         """Fallback method to split text when patterns don't match."""
-        # Split by paragraphs and group them
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        
-        # Group paragraphs into course sections (simple heuristic)
-        sections = []
+        return list(self._group_paragraphs(self._iter_paragraphs([text])))
+    
+    @staticmethod
+    def _iter_paragraphs(chunks: Iterable[str]) -> Iterator[str]:
+        """Yield the non-empty paragraphs of text arriving in chunks."""
+        tail = ""
+        for chunk in chunks:
+            *paragraphs, tail = (tail + chunk).split('\n\n')
+            yield from (p.strip() for p in paragraphs if p.strip())
+        if tail.strip():
+            yield tail.strip()
+    
+    @staticmethod
+    def _group_paragraphs(paragraphs: Iterable[str]) -> Iterator[str]:
+        """Group paragraphs into course sections (simple heuristic)."""
         current_section = ""
         
         for para in paragraphs:
             if len(para) > 200 and any(keyword in para.lower() for keyword in ['course', 'learn', 'master', 'beginner', 'advanced']):
                 if current_section:
-                    sections.append(current_section)
+                    yield current_section
                 current_section = para
             else:
                 current_section += "\n\n" + para if current_section else para
         
         if current_section:
-            sections.append(current_section)
-        
-        return sections
+            yield current_section
     
     def _extract_course_info(self, text: str, index: int) -> Optional[Dict[str, Any]]:
-        """Extract structured information from a course section."""
+        """Extract structured information from a course section.
+        
+        The section is split into lines and lowercased once and every field
+        extractor works from those with the module-level compiled patterns.
+        Patterns whose marker word is absent from the section are skipped.
+        """
         try:
             # Extract course name (usually the first line or after a number)
             lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -130,15 +318,17 @@ class DataIngestionService:
                 title = f"Course {index + 1}"
             
             # Extract other information
+            text_lower = text.lower()
             price = self._extract_price(text)
-            level = self._extract_level(text)
+            level = self._extract_level(text_lower)
             duration = self._extract_duration(text)
-            description = self._extract_description(text)
-            topics = self._extract_topics(text)
-            features = self._extract_features(text)
+            description = self._extract_description(lines)
+            topics = self._extract_topics(text, text_lower)
+            features = self._extract_features(text, text_lower)
             
-            # Generate tags from content
-            tags = self._generate_tags(title, description, topics)
+            # Generate tags and category from the course content
+            content_lower = f"{title} {description} {' '.join(topics)}".lower()
+            tags = self._generate_tags(content_lower)
             
             return {
                 'id': f"course_{index + 1}",
@@ -151,7 +341,7 @@ class DataIngestionService:
                 'features': features,
                 'tags': tags,
                 'full_content': text,
-                'category': self._infer_category(title, description, topics)
+                'category': self._infer_category(content_lower)
             }
             
         except Exception as e:
@@ -162,24 +352,15 @@ class DataIngestionService:
         """Extract course title from lines."""
         for line in lines:
             # Remove common prefixes
-            clean_line = re.sub(r'^(\d+\.?\s*|Course\s*\d*:?\s*)', '', line, flags=re.IGNORECASE).strip()
+            clean_line = TITLE_PREFIX_PATTERN.sub('', line).strip()
             if clean_line and len(clean_line) > 5:
                 return clean_line
         return lines[0] if lines else "Untitled Course"
     
     def _extract_price(self, text: str) -> float:
         """Extract price from text."""
-        # Look for price patterns
-        price_patterns = [
-            r'₹\s*(\d+(?:,\d+)*)',  # ₹1,299
-            r'INR\s*(\d+(?:,\d+)*)',  # INR 1299
-            r'Rs\.?\s*(\d+(?:,\d+)*)',  # Rs. 1299
-            r'\$\s*(\d+(?:,\d+)*)',  # $99
-            r'(\d+(?:,\d+)*)\s*(?:rupees|INR|₹)',  # 1299 rupees
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in PRICE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 price_str = match.group(1).replace(',', '')
                 try:
@@ -190,239 +371,475 @@ class DataIngestionService:
         # Default price if not found
         return 1299.0
     
-    def _extract_level(self, text: str) -> str:
-        """Extract difficulty level from text."""
-        text_lower = text.lower()
-        if any(word in text_lower for word in ['beginner', 'basic', 'intro', 'foundation']):
-            return 'beginner'
-        elif any(word in text_lower for word in ['advanced', 'expert', 'master']):
-            return 'advanced'
-        elif any(word in text_lower for word in ['intermediate', 'medium']):
-            return 'intermediate'
+    def _extract_level(self, text_lower: str) -> str:
+        """Extract difficulty level from lowercased text."""
+        for level, words in LEVEL_KEYWORDS.items():
+            if any(word in text_lower for word in words):
+                return level
         return 'beginner'  # Default
     
     def _extract_duration(self, text: str) -> Optional[str]:
         """Extract course duration from text."""
-        duration_patterns = [
-            r'(\d+)\s*(?:weeks?|months?|days?|hours?)',
-            r'Duration:\s*([^\n]+)',
-            r'Time:\s*([^\n]+)',
-        ]
-        
-        for pattern in duration_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in DURATION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
         return None
     
-    def _extract_description(self, text: str) -> str:
+    def _extract_description(self, lines: List[str]) -> str:
         """Extract course description."""
-        # Take the first substantial paragraph that's not the title
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
+        # Take the first substantial lines that aren't the title
         description_lines = []
+        length = 0
         for line in lines[1:]:  # Skip the first line (likely title)
-            if len(line) > 20 and not re.match(r'^\d+\.', line):
+            if len(line) > 20 and not NUMBERED_LINE_PATTERN.match(line):
                 description_lines.append(line)
-                if len(' '.join(description_lines)) > 200:
+                length += len(line) + (1 if len(description_lines) > 1 else 0)
+                if length > 200:
                     break
         
         description = ' '.join(description_lines)
         return description[:500] + "..." if len(description) > 500 else description
     
-    def _extract_topics(self, text: str) -> List[str]:
+    def _extract_topics(self, text: str, text_lower: str) -> List[str]:
         """Extract course topics/modules."""
         topics = []
         
         # Look for bullet points, numbered lists, etc.
-        patterns = [
-            r'[•·▪▫]\s*([^\n]+)',  # Bullet points
-            r'\d+\.\s*([^\n]+)',  # Numbered items
-            r'Topics?:\s*([^\n]+)',  # "Topics:" followed by list
-            r'Modules?:\s*([^\n]+)',  # "Modules:" followed by list
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            topics.extend([match.strip() for match in matches])
+        for marker, pattern in TOPIC_PATTERNS:
+            if marker is None and not any(char in text for char in BULLET_CHARS):
+                continue
+            if marker is not None and marker not in text_lower:
+                continue
+            topics.extend(match.strip() for match in pattern.findall(text))
         
         # Clean and deduplicate
         cleaned_topics = []
         for topic in topics:
-            topic = re.sub(r'^[•·▪▫\d\.\s-]+', '', topic).strip()
+            topic = TOPIC_PREFIX_PATTERN.sub('', topic).strip()
             if topic and len(topic) > 3 and topic not in cleaned_topics:
                 cleaned_topics.append(topic[:100])  # Limit length
         
         return cleaned_topics[:10]  # Limit to top 10
     
-    def _extract_features(self, text: str) -> List[str]:
+    def _extract_features(self, text: str, text_lower: str) -> List[str]:
         """Extract course features/benefits."""
-        features = []
-        
-        # Common feature indicators
-        feature_keywords = [
-            'certificate', 'certification', 'hands-on', 'projects', 'mentorship',
-            'support', 'lifetime access', 'refund', 'bootcamp', 'workshop'
-        ]
-        
-        text_lower = text.lower()
-        for keyword in feature_keywords:
-            if keyword in text_lower:
-                features.append(keyword.title())
+        features = [keyword.title() for keyword in FEATURE_KEYWORDS if keyword in text_lower]
         
         # Look for explicit feature lists
-        feature_patterns = [
-            r'Features?:\s*([^\n]+)',
-            r'Benefits?:\s*([^\n]+)',
-            r'Includes?:\s*([^\n]+)',
-        ]
-        
-        for pattern in feature_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for marker, pattern in FEATURE_LIST_PATTERNS:
+            if marker not in text_lower:
+                continue
+            for match in pattern.findall(text):
                 features.extend([f.strip() for f in match.split(',') if f.strip()])
         
-        return list(set(features))[:5]  # Limit and deduplicate
+        return list(dict.fromkeys(features))[:5]  # Limit and deduplicate
     
-    def _generate_tags(self, title: str, description: str, topics: List[str]) -> List[str]:
-        """Generate tags from course content."""
-        combined_text = f"{title} {description} {' '.join(topics)}".lower()
-        
-        # Technology keywords
-        tech_keywords = [
-            'python', 'javascript', 'java', 'node.js', 'react', 'angular', 'vue',
-            'django', 'flask', 'spring', 'html', 'css', 'sql', 'mongodb',
-            'aws', 'azure', 'docker', 'kubernetes', 'git', 'api', 'rest',
-            'graphql', 'microservices', 'database', 'frontend', 'backend',
-            'fullstack', 'mobile', 'android', 'ios', 'machine learning',
-            'data science', 'artificial intelligence', 'blockchain', 'devops'
-        ]
-        
-        tags = []
-        for keyword in tech_keywords:
-            if keyword in combined_text:
-                tags.append(keyword)
-        
-        return tags[:8]  # Limit to 8 tags
+    def _generate_tags(self, content_lower: str) -> List[str]:
+        """Generate tags from the lowercased course content."""
+        return [keyword for keyword in TECH_KEYWORDS if keyword in content_lower][:8]  # Limit to 8 tags
     
-    def _infer_category(self, title: str, description: str, topics: List[str]) -> str:
+    def _infer_category(self, content_lower: str) -> str:
         """Infer course category."""
-        combined_text = f"{title} {description} {' '.join(topics)}".lower()
-        
-        categories = {
-            'Programming': ['python', 'javascript', 'java', 'programming', 'coding', 'software'],
-            'Web Development': ['html', 'css', 'react', 'angular', 'vue', 'web', 'frontend', 'backend'],
-            'Data Science': ['data', 'analytics', 'machine learning', 'ai', 'statistics', 'pandas'],
-            'Mobile Development': ['android', 'ios', 'mobile', 'app development', 'flutter', 'react native'],
-            'Cloud & DevOps': ['aws', 'azure', 'cloud', 'docker', 'kubernetes', 'devops', 'ci/cd'],
-            'Business': ['management', 'business', 'marketing', 'strategy', 'entrepreneurship'],
-            'Design': ['ui', 'ux', 'design', 'figma', 'photoshop', 'graphics']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in combined_text for keyword in keywords):
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if any(keyword in content_lower for keyword in keywords):
                 return category
         
         return 'General'
     
-    async def generate_embeddings(self, courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate embeddings for course content."""
+    async def generate_embeddings(
+        self,
+        courses: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate embeddings for course content.
+        
+        Courses are encoded in batches, grouped by text length to minimise
+        padding, and returned in their original order. If a batch fails, its
+        courses are retried one by one so a single bad course is skipped
+        without losing the rest.
+        
+        Args:
+            courses: Parsed course dictionaries
+            batch_size: Courses per model call; defaults to ``settings.INGESTION_BATCH_SIZE``
+            progress_callback: Called with (courses done, total) after each batch
+            
+        Returns:
+            Copies of the courses with ``embedding`` and ``embedding_text`` added
+        """
         if not self.embedding_model:
             raise RuntimeError("Embedding model not initialized")
         
-        enhanced_courses = []
+        batch_size = max(1, batch_size or settings.INGESTION_BATCH_SIZE)
+        started_at = time.perf_counter()
         
-        for course in courses:
+        # Combine relevant text for embedding
+        texts: Dict[int, str] = {}
+        for index, course in enumerate(courses):
             try:
-                # Combine relevant text for embedding
-                embedding_text = f"{course['title']} {course['description']} {' '.join(course['topics'])} {' '.join(course['tags'])}"
-                
-                # Generate embedding
-                embedding = self.embedding_model.encode(
-                    embedding_text,
+                texts[index] = self._embedding_text(course)
+            except Exception as e:
+                logger.error(f"Failed to generate embedding for course {course.get('id', 'unknown')}: {e}")
+        
+        order = sorted(texts, key=lambda index: len(texts[index]))
+        embeddings: Dict[int, List[float]] = {}
+        
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            try:
+                vectors = await self.executor.run(
+                    self.embedding_model.encode,
+                    [texts[index] for index in batch],
+                    batch_size=len(batch),
                     convert_to_numpy=True,
-                    normalize_embeddings=True
+                    normalize_embeddings=True,
+                    show_progress_bar=False
                 )
-                
-                course_with_embedding = course.copy()
-                course_with_embedding['embedding'] = embedding.tolist()
-                course_with_embedding['embedding_text'] = embedding_text
-                
-                enhanced_courses.append(course_with_embedding)
-                
+                for index, vector in zip(batch, vectors.tolist()):
+                    embeddings[index] = vector
             except Exception as e:
-                logger.error(f"Failed to generate embedding for course {course.get('id', 'unknown')}: {e}")
-                continue
+                logger.warning(f"Batch of {len(batch)} courses failed ({e}), retrying individually")
+                for index in batch:
+                    try:
+                        vector = await self.executor.run(
+                            self.embedding_model.encode,
+                            texts[index],
+                            convert_to_numpy=True,
+                            normalize_embeddings=True,
+                            show_progress_bar=False
+                        )
+                        embeddings[index] = vector.tolist()
+                    except Exception as course_error:
+                        logger.error(f"Failed to generate embedding for course {courses[index].get('id', 'unknown')}: {course_error}")
+            
+            if progress_callback:
+                progress_callback(min(start + len(batch), len(order)), len(order))
         
-        logger.info(f"Generated embeddings for {len(enhanced_courses)} courses")
+        enhanced_courses = []
+        for index, course in enumerate(courses):
+            if index not in embeddings:
+                continue
+            course_with_embedding = course.copy()
+            course_with_embedding['embedding'] = embeddings[index]
+            course_with_embedding['embedding_text'] = texts[index]
+            enhanced_courses.append(course_with_embedding)
+        
+        elapsed = time.perf_counter() - started_at
+        rate = len(enhanced_courses) / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Generated embeddings for {len(enhanced_courses)} courses in {elapsed:.2f}s ({rate:.1f} courses/sec)")
         return enhanced_courses
     
-    async def process_catalog(self, pdf_path: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _embedding_text(course: Dict[str, Any]) -> str:
+        """Build the text a course is embedded from."""
+        return f"{course['title']} {course['description']} {' '.join(course['topics'])} {' '.join(course['tags'])}"
+    
+    def _content_hash(self, course: Dict[str, Any]) -> str:
+        """Hash everything about a course that ends up in the vector store."""
+        payload = {
+            'embedding_text': self._embedding_text(course),
+            'metadata': {name: course.get(name) for name in HASHED_METADATA_FIELDS}
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    async def sync_courses(
+        self,
+        courses: Iterable[Dict[str, Any]],
+        source: str,
+        progress: Optional[IngestionProgress] = None
+    ) -> List[Dict[str, Any]]:
+        """Bring the vector store in line with ``courses``, embedding only what changed.
+        
+        Courses flow through three concurrent stages joined by bounded
+        queues: the source is drained in chunks off the event loop, new and
+        changed courses are embedded in batches, and each embedded batch is
+        upserted while the next one is being encoded. A full queue stalls the
+        stage feeding it, so only a few batches are in memory at a time and
+        the run takes about as long as its slowest stage.
+        
+        Each course is tagged with a content hash and its source and compared
+        against the hash stored with it; unchanged courses cost neither
+        inference nor writes. Once the source is exhausted, courses stored
+        from the same source (or sample courses) but missing from it are
+        deleted, unless some courses failed in this run, and the processed
+        snapshot is rewritten if anything changed.
+        
+        Args:
+            courses: The complete catalog of ``source``; may be a lazy iterator
+            source: Catalog the courses come from, e.g. "pdf" or "json"
+            progress: Counters to update while the run is in flight
+            
+        Returns:
+            The synced courses, without their embeddings
+        """
+        progress = progress or IngestionProgress()
+        batch_size = max(1, settings.INGESTION_BATCH_SIZE)
+        queue_batches = max(1, settings.INGESTION_QUEUE_BATCHES)
+        
+        stored_hashes = {}
+        if vector_store.is_initialized:
+            stored_hashes = await vector_store.get_content_hashes([source, SAMPLE_SOURCE])
+        if not vector_store.is_initialized:
+            logger.warning("Vector store not initialized, courses will be embedded but not stored")
+        
+        parsed_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * queue_batches)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_batches)
+        seen: Dict[str, Dict[str, Any]] = {}
+        unsaved: Dict[str, Dict[str, Any]] = {}
+        
+        progress.phase = "ingesting"
+        stages = [
+            asyncio.create_task(self._parse_stage(iter(courses), parsed_queue, batch_size, progress)),
+            asyncio.create_task(
+                self._embed_stage(parsed_queue, write_queue, batch_size, source, stored_hashes, seen, progress)
+            ),
+            asyncio.create_task(self._write_stage(write_queue, unsaved, progress)),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            # A failed or cancelled stage must not leave the others blocked on a queue
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        
+        if not seen:
+            logger.warning("No courses in source, leaving the vector store untouched")
+            return []
+        
+        removed = [doc_id for doc_id in stored_hashes if doc_id not in seen]
+        if removed and progress.failed:
+            # A course that failed this run is missing from ``seen`` without
+            # having left the catalog
+            logger.warning(
+                f"{progress.failed} courses failed, keeping {len(removed)} stored {source} courses missing from this run"
+            )
+            removed = []
+        if removed and vector_store.is_initialized:
+            progress.phase = "deleting"
+            if await vector_store.delete_courses(removed):
+                progress.deleted = len(removed)
+        
+        if not progress.written and not progress.deleted:
+            logger.info(f"Catalog unchanged ({len(seen)} courses), nothing to sync")
+            return list(seen.values())
+        
+        progress.phase = "snapshot"
+        await self._save_processed_data(source, seen, unsaved)
+        
+        logger.info(
+            f"Synced catalog in {progress.elapsed():.2f}s: {progress.written} upserted, "
+            f"{progress.deleted} deleted, {progress.unchanged} unchanged, {progress.failed} failed"
+        )
+        return list(seen.values())
+    
+    async def _parse_stage(
+        self,
+        courses: Iterator[Dict[str, Any]],
+        parsed_queue: asyncio.Queue,
+        chunk_size: int,
+        progress: IngestionProgress
+    ) -> None:
+        """Pull courses from a (possibly blocking) iterator onto the parsed queue.
+        
+        The iterator is closed when the stage ends, cancelled or not, so a
+        PDF stream shuts its extraction pool down. Pulls run on a pool thread
+        that may still be busy after a cancel, so closing waits for it.
+        """
+        lock = threading.Lock()
+        
+        def pull() -> List[Dict[str, Any]]:
+            with lock:
+                return list(itertools.islice(courses, chunk_size))
+        
+        def close() -> None:
+            with lock:
+                if hasattr(courses, 'close'):
+                    courses.close()
+        
+        try:
+            while True:
+                chunk = await self.executor.run(pull)
+                if not chunk:
+                    break
+                for course in chunk:
+                    await parsed_queue.put(course)
+                progress.parsed += len(chunk)
+            await parsed_queue.put(_PIPELINE_DONE)
+        finally:
+            await self.executor.run(close)
+    
+    async def _embed_stage(
+        self,
+        parsed_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        batch_size: int,
+        source: str,
+        stored_hashes: Dict[str, str],
+        seen: Dict[str, Dict[str, Any]],
+        progress: IngestionProgress
+    ) -> None:
+        """Hash parsed courses and embed the new or changed ones in batches."""
+        done = False
+        while not done:
+            batch = []
+            while len(batch) < batch_size:
+                course = await parsed_queue.get()
+                if course is _PIPELINE_DONE:
+                    done = True
+                    break
+                
+                try:
+                    course = {**course, 'content_hash': self._content_hash(course), 'source': source}
+                except Exception as e:
+                    logger.error(f"Failed to hash course {course.get('id', 'unknown')}: {e}")
+                    progress.failed += 1
+                    progress.errors.append(f"{course.get('id', 'unknown')}: {e}")
+                    continue
+                
+                seen[course['id']] = course
+                if stored_hashes.get(course['id']) == course['content_hash']:
+                    progress.unchanged += 1
+                else:
+                    batch.append(course)
+            
+            if batch:
+                if not self.embedding_model:
+                    await self.initialize()
+                embedded = await self.generate_embeddings(batch)
+                progress.embedded += len(embedded)
+                progress.failed += len(batch) - len(embedded)
+                if embedded:
+                    await write_queue.put(embedded)
+        
+        await write_queue.put(_PIPELINE_DONE)
+    
+    async def _write_stage(
+        self,
+        write_queue: asyncio.Queue,
+        unsaved: Dict[str, Dict[str, Any]],
+        progress: IngestionProgress
+    ) -> None:
+        """Upsert embedded batches into the vector store as they arrive."""
+        while True:
+            batch = await write_queue.get()
+            if batch is _PIPELINE_DONE:
+                break
+            
+            if vector_store.is_initialized:
+                if not await vector_store.add_courses(batch):
+                    raise RuntimeError("Failed to upsert courses into vector store")
+            else:
+                unsaved.update((course['id'], course) for course in batch)
+            progress.written += len(batch)
+    
+    async def process_catalog(
+        self,
+        pdf_path: str,
+        progress: Optional[IngestionProgress] = None
+    ) -> List[Dict[str, Any]]:
         """Complete pipeline to process course catalog."""
+        progress = progress or IngestionProgress()
         try:
             logger.info(f"Processing course catalog: {pdf_path}")
             
-            # Initialize if not already done
-            if not self.embedding_model:
-                await self.initialize()
-            
-            # Extract text from PDF
-            text_content = self.extract_text_from_pdf(pdf_path)
-            if not text_content:
-                logger.error("No text extracted from PDF")
+            # Pages are extracted in parallel, parsed as they arrive and
+            # streamed straight into the embed and write stages
+            courses = self.iter_courses(self.iter_pdf_pages(pdf_path), progress)
+            enhanced_courses = await self.sync_courses(courses, "pdf", progress)
+            if not enhanced_courses:
+                logger.error("No courses parsed from catalog")
                 return []
             
-            # Parse courses
-            courses = self.parse_course_catalog(text_content)
-            if not courses:
-                logger.error("No courses parsed from text")
-                return []
-            
-            # Generate embeddings
-            enhanced_courses = await self.generate_embeddings(courses)
-            
-            # Save processed data
-            await self._save_processed_data(enhanced_courses)
-            
             logger.info(f"Successfully processed {len(enhanced_courses)} courses")
             return enhanced_courses
             
         except Exception as e:
             logger.error(f"Failed to process catalog: {e}")
+            progress.errors.append(str(e))
             return []
     
-    async def _save_processed_data(self, courses: List[Dict[str, Any]]) -> None:
-        """Save processed course data to a JSON file."""
+    async def _save_processed_data(
+        self,
+        source: str,
+        seen: Dict[str, Dict[str, Any]],
+        unsaved: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Rewrite the processed snapshot after a sync, one page of rows at a time.
+        
+        The snapshot covers the whole catalog: the synced courses, paged out
+        of the vector store (or taken from ``unsaved`` when they could not be
+        stored), plus other sources' courses carried over from the current
+        snapshot. Rows are streamed into a preallocated memory-mapped matrix,
+        so only one page of embeddings is in memory at a time.
+        """
+        page_size = max(1, settings.SNAPSHOT_PAGE_SIZE)
         try:
-            output_path = os.path.join(os.path.dirname(__file__), '../../data/processed_courses.json')
-            
-            # Prepare data for JSON serialization
-            json_data = {
-                'processed_at': datetime.utcnow().isoformat(),
-                'total_courses': len(courses),
-                'courses': []
-            }
-            
-            for course in courses:
-                course_json = course.copy()
-                # Convert numpy arrays to lists for JSON serialization
-                if 'embedding' in course_json:
-                    course_json['embedding'] = course_json['embedding']  # Already converted to list
-                json_data['courses'].append(course_json)
-            
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Saved processed course data to {output_path}")
+            previous, previous_embeddings = await self.executor.run(self._load_previous_snapshot)
+            retained = [
+                row for row, course in enumerate(previous)
+                if course.get('source', '') not in (source, SAMPLE_SOURCE) and course['id'] not in seen
+            ]
+            stored_ids = [doc_id for doc_id in seen if doc_id not in unsaved]
+            
+            writer = SnapshotWriter(
+                len(unsaved) + len(stored_ids) + len(retained),
+                dtype=settings.SNAPSHOT_EMBEDDING_DTYPE
+            )
+            try:
+                pending = list(unsaved.values())
+                for start in range(0, len(pending), page_size):
+                    page = pending[start:start + page_size]
+                    matrix = np.asarray([course['embedding'] for course in page], dtype=np.float32)
+                    await self.executor.run(writer.append, page, matrix)
+                
+                async for ids, matrix in vector_store.iter_embeddings(stored_ids, page_size):
+                    page = [{**seen[doc_id], 'embedding_text': self._embedding_text(seen[doc_id])} for doc_id in ids]
+                    await self.executor.run(writer.append, page, matrix)
+                
+                for start in range(0, len(retained), page_size):
+                    await self.executor.run(
+                        self._copy_snapshot_rows, writer, previous, previous_embeddings,
+                        retained[start:start + page_size]
+                    )
+                
+                count = await self.executor.run(writer.commit)
+            except BaseException:
+                writer.abort()
+                raise
+            logger.info(f"Saved processed snapshot of {count} courses to {snapshot_paths()[1]}")
             
         except Exception as e:
             logger.error(f"Failed to save processed data: {e}")
+    
+    @staticmethod
+    def _load_previous_snapshot() -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        """The current snapshot, memory-mapped, or no courses if there is none."""
+        try:
+            return load_snapshot(verify=False)
+        except SnapshotError:
+            return [], None
+    
+    @staticmethod
+    def _copy_snapshot_rows(
+        writer: SnapshotWriter,
+        courses: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        rows: List[int]
+    ) -> None:
+        """Append ``rows`` of an existing snapshot to ``writer``."""
+        writer.append([courses[row] for row in rows], embeddings[rows])
 
-    async def process_json_catalog(self, json_path: str) -> List[Dict[str, Any]]:
+    async def process_json_catalog(
+        self,
+        json_path: str,
+        progress: Optional[IngestionProgress] = None
+    ) -> List[Dict[str, Any]]:
         """Process course catalog from JSON file."""
+        progress = progress or IngestionProgress()
         try:
             logger.info(f"Processing JSON catalog from: {json_path}")
             
@@ -436,18 +853,20 @@ class DataIngestionService:
                     processed_course = await self._process_json_course(course_data)
                     if processed_course:
                         courses.append(processed_course)
+                    else:
+                        progress.failed += 1
             
             logger.info(f"Processed {len(courses)} courses from JSON")
             
-            # Generate embeddings
+            # Embed and store new or changed courses
             if courses:
-                courses = await self.generate_embeddings(courses)
-                await self._save_processed_data(courses)
+                courses = await self.sync_courses(courses, "json", progress)
             
             return courses
             
         except Exception as e:
             logger.error(f"Failed to process JSON catalog: {e}")
+            progress.errors.append(str(e))
             return []
     
     async def _process_json_course(self, course_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
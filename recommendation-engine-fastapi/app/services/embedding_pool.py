@@ -0,0 +1,358 @@
+import os
+import sys
+import time
+import queue
+import logging
+import itertools
+import threading
+import multiprocessing as mp
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional, Union
+import numpy as np
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds between liveness checks of busy workers while no results arrive
+WORKER_CHECK_INTERVAL = 1.0
+
+def _worker_main(
+    worker_id: int,
+    model_name: str,
+    backend: str,
+    num_threads: int,
+    task_queue,
+    result_queue
+) -> None:
+    """Entry point of an embedding worker process.
+
+    Loads the model once, reports its embedding dimension, then encodes batches
+    from ``task_queue`` and writes the float32 rows straight into the shared
+    memory buffer the parent assigned to this worker.
+    """
+    # Keep each worker to its share of the cores
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    from .model_registry import model_registry
+
+    try:
+        model = model_registry.get_embedding_model(model_name, backend=backend)
+        # Checked after loading rather than by backend: the ONNX backend falls
+        # back to torch, which would otherwise run on every core
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(num_threads)
+        dimension = int(model.encode(["warm up"], convert_to_numpy=True).shape[1])
+    except Exception as e:
+        result_queue.put(("failed", worker_id, str(e)))
+        return
+
+    result_queue.put(("ready", worker_id, dimension))
+
+    buffer = None
+    while True:
+        message = task_queue.get()
+        if message is None:
+            break
+
+        if message[0] == "buffer":
+            buffer = shared_memory.SharedMemory(name=message[1])
+            continue
+
+        _, task_id, texts, normalize = message
+        try:
+            embeddings = model.encode(
+                texts,
+                batch_size=len(texts),
+                convert_to_numpy=True,
+                normalize_embeddings=normalize,
+                show_progress_bar=False
+            )
+            out = np.ndarray((len(texts), dimension), dtype=np.float32, buffer=buffer.buf)
+            out[:] = embeddings
+            del out
+            result_queue.put(("done", task_id, worker_id))
+        except Exception as e:
+            result_queue.put(("error", task_id, worker_id, str(e)))
+
+    if buffer is not None:
+        buffer.close()
+
+class EmbeddingWorkerPool:
+    """Encode texts in a pool of subprocesses that each hold the model.
+
+    This moves inference out of the API process, so it no longer competes with
+    request handling for the GIL, and lets one API process use every core.
+    Each worker owns a shared-memory buffer sized for one full batch: the
+    worker writes its embeddings there and the parent copies them out, so
+    result rows are never pickled. ``encode`` mirrors the subset of
+    ``SentenceTransformer.encode`` that the app uses.
+
+    A worker that dies is restarted: its in-flight task fails instead of
+    hanging, and the replacement rejoins the pool once it has loaded the
+    model. Waiting for a free worker is bounded by ``REQUEST_TIMEOUT``.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EmbeddingWorkerPool, cls).__new__(cls)
+            cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self.num_workers = 0
+        self.max_batch_size = 0
+        self.dimension = None
+        self.is_started = False
+        self._start_lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self._context = None
+        self._worker_args = ()
+        self._restarting = set()
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+        self._buffers: List[shared_memory.SharedMemory] = []
+        self._idle: "queue.Queue[int]" = queue.Queue()
+        self._pending: Dict[int, tuple] = {}
+        self._task_ids = itertools.count()
+        self._collector = None
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+        self.restarts = 0
+
+    def start(
+        self,
+        num_workers: Optional[int] = None,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None
+    ) -> None:
+        """Spawn the workers and wait until every one has loaded its model.
+
+        Raises:
+            RuntimeError: If a worker fails to load the model, or not all of
+                them are ready within ``EMBEDDING_WORKER_START_TIMEOUT``
+                seconds. The workers are stopped, so ``start`` can be retried.
+        """
+        with self._start_lock:
+            if self.is_started:
+                return
+
+            self.num_workers = num_workers or settings.EMBEDDING_WORKERS
+            self.max_batch_size = max(1, settings.EMBEDDING_WORKER_MAX_BATCH)
+            model_name = model_name or settings.EMBEDDING_MODEL
+            backend = (backend or settings.EMBEDDING_BACKEND).lower()
+
+            # Never fork a process that may already have torch threads running
+            self._context = mp.get_context("spawn")
+            self._result_queue = self._context.Queue()
+            self._worker_args = (model_name, backend, settings.EMBEDDING_WORKER_THREADS)
+            self._processes = [None] * self.num_workers
+            self._task_queues = [None] * self.num_workers
+            for worker_id in range(self.num_workers):
+                self._spawn_worker(worker_id)
+
+            logger.info(f"Waiting for {self.num_workers} embedding workers to load {model_name}...")
+            deadline = time.monotonic() + settings.EMBEDDING_WORKER_START_TIMEOUT
+            for _ in range(self.num_workers):
+                try:
+                    message = self._result_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._terminate()
+                    raise RuntimeError(
+                        f"Embedding workers did not load {model_name} within "
+                        f"{settings.EMBEDDING_WORKER_START_TIMEOUT}s"
+                    )
+                if message[0] != "ready":
+                    self._terminate()
+                    raise RuntimeError(f"Embedding worker {message[1]} failed to start: {message[2]}")
+                self.dimension = message[2]
+
+            for worker_id, task_queue in enumerate(self._task_queues):
+                buffer = shared_memory.SharedMemory(
+                    create=True,
+                    size=self.max_batch_size * self.dimension * np.dtype(np.float32).itemsize
+                )
+                self._buffers.append(buffer)
+                task_queue.put(("buffer", buffer.name))
+                self._idle.put(worker_id)
+
+            self._collector = threading.Thread(
+                target=self._collect_results,
+                name="embedding-pool-collector",
+                daemon=True
+            )
+            self._collector.start()
+            self.is_started = True
+            logger.info(f"Embedding worker pool ready ({self.num_workers} workers, dim={self.dimension})")
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: Optional[int] = None,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Encode texts across the workers; blocks until every chunk is done.
+
+        Inputs larger than one worker buffer are split into chunks that run
+        on several workers in parallel.
+        """
+        if not self.is_started:
+            raise RuntimeError("Embedding worker pool not started")
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        chunk_size = min(batch_size or self.max_batch_size, self.max_batch_size)
+        futures = [
+            self._dispatch(texts[start:start + chunk_size], normalize_embeddings)
+            for start in range(0, len(texts), chunk_size)
+        ]
+        embeddings = np.vstack([future.result(timeout=settings.REQUEST_TIMEOUT) for future in futures])
+        return embeddings[0] if single else embeddings
+
+    def _spawn_worker(self, worker_id: int) -> None:
+        model_name, backend, num_threads = self._worker_args
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, model_name, backend, num_threads, task_queue, self._result_queue),
+            name=f"embedding-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._task_queues[worker_id] = task_queue
+
+    def _restart_worker(self, worker_id: int) -> None:
+        """Replace a dead worker; it becomes idle again once its model has loaded."""
+        with self._restart_lock:
+            if worker_id in self._restarting or self._processes[worker_id].is_alive():
+                return
+            logger.warning(
+                f"Embedding worker {worker_id} died (exit code {self._processes[worker_id].exitcode}), restarting"
+            )
+            self._restarting.add(worker_id)
+            self._spawn_worker(worker_id)
+            # Queued now, read by the worker as soon as its model is loaded
+            self._task_queues[worker_id].put(("buffer", self._buffers[worker_id].name))
+            self.restarts += 1
+
+    def _dispatch(self, texts: List[str], normalize: bool) -> Future:
+        while True:
+            try:
+                worker_id = self._idle.get(timeout=settings.REQUEST_TIMEOUT)
+            except queue.Empty:
+                raise RuntimeError(f"No embedding worker became available within {settings.REQUEST_TIMEOUT}s")
+            if self._processes[worker_id].is_alive():
+                break
+            self._restart_worker(worker_id)
+
+        task_id = next(self._task_ids)
+        future = Future()
+        self._pending[task_id] = (future, worker_id, len(texts))
+        self._task_queues[worker_id].put(("encode", task_id, texts, normalize))
+        return future
+
+    def _collect_results(self) -> None:
+        while True:
+            try:
+                message = self._result_queue.get(timeout=WORKER_CHECK_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if message is None:
+                break
+
+            if message[0] in ("ready", "failed"):
+                self._worker_restarted(*message)
+                continue
+
+            kind, task_id, worker_id = message[:3]
+            entry = self._pending.pop(task_id, None)
+            if entry is None:
+                # Already failed by the liveness check
+                continue
+            future, _, count = entry
+            if kind == "done":
+                rows = np.ndarray((count, self.dimension), dtype=np.float32, buffer=self._buffers[worker_id].buf)
+                # Copy out before the worker's buffer is handed to the next task
+                future.set_result(rows.copy())
+                del rows
+                self.tasks_completed += 1
+            else:
+                future.set_exception(RuntimeError(f"Embedding worker {worker_id} failed: {message[3]}"))
+                self.tasks_failed += 1
+            self._idle.put(worker_id)
+            self._check_workers()
+
+    def _check_workers(self) -> None:
+        """Fail the tasks of workers that died mid-task and restart those workers."""
+        for task_id, (future, worker_id, _) in list(self._pending.items()):
+            if self._processes[worker_id].is_alive() or self._pending.pop(task_id, None) is None:
+                continue
+            future.set_exception(RuntimeError(f"Embedding worker {worker_id} died while encoding"))
+            self.tasks_failed += 1
+            self._restart_worker(worker_id)
+
+        for worker_id in list(self._restarting):
+            if not self._processes[worker_id].is_alive():
+                self._worker_restarted("failed", worker_id, "exited while loading the model")
+
+    def _worker_restarted(self, kind: str, worker_id: int, detail: Any) -> None:
+        with self._restart_lock:
+            self._restarting.discard(worker_id)
+        if kind == "ready":
+            logger.info(f"Embedding worker {worker_id} restarted")
+            self._idle.put(worker_id)
+        else:
+            logger.error(f"Embedding worker {worker_id} failed to restart: {detail}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return worker counts and task statistics."""
+        return {
+            'workers': self.num_workers,
+            'alive': sum(1 for process in self._processes if process is not None and process.is_alive()),
+            'idle': self._idle.qsize(),
+            'restarting': len(self._restarting),
+            'restarts': self.restarts,
+            'tasks_completed': self.tasks_completed,
+            'tasks_failed': self.tasks_failed
+        }
+
+    def shutdown(self) -> None:
+        """Stop the workers and release the shared memory buffers."""
+        with self._start_lock:
+            if not self.is_started:
+                return
+            for task_queue in self._task_queues:
+                task_queue.put(None)
+            for process in self._processes:
+                process.join(timeout=5)
+            self._result_queue.put(None)
+            self._terminate()
+            self.is_started = False
+
+    def _terminate(self) -> None:
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for buffer in self._buffers:
+            buffer.close()
+            buffer.unlink()
+        self._processes = []
+        self._task_queues = []
+        self._buffers = []
+        self._restarting = set()
+        self._idle = queue.Queue()
+
+# Singleton instance
+embedding_pool = EmbeddingWorkerPool()
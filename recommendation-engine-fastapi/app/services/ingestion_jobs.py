@@ -0,0 +1,182 @@
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List, Dict, Any, Optional
+
+from .data_ingestion import data_ingestion_service, IngestionProgress
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class IngestionInProgressError(Exception):
+    """Raised when an ingestion is requested while another one is running."""
+
+    def __init__(self, job: "IngestionJob"):
+        super().__init__(f"Ingestion job {job.id} is already {job.status.value}")
+        self.job = job
+
+@dataclass
+class IngestionJob:
+    """One catalog ingestion run and its live progress."""
+    id: str
+    source: str
+    path: str
+    status: JobStatus = JobStatus.PENDING
+    progress: IngestionProgress = field(default_factory=IngestionProgress)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    courses: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'source': self.source,
+            'path': self.path,
+            'status': self.status.value,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'courses': self.courses,
+            **self.progress.as_dict()
+        }
+
+class IngestionJobManager:
+    """Run catalog ingestions as tracked background jobs, one at a time.
+
+    Only one job may be active: a second request is rejected with
+    ``IngestionInProgressError`` instead of loading the model twice and racing
+    the first one's writes. Finished jobs are kept for status queries up to
+    ``INGESTION_JOB_HISTORY``.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IngestionJobManager, cls).__new__(cls)
+            cls._instance._setup()
+        return cls._instance
+
+    def _setup(self):
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self.active_job: Optional[IngestionJob] = None
+
+    def start(self, source: str, path: str) -> IngestionJob:
+        """Start ingesting ``path`` in the background.
+
+        Args:
+            source: "pdf" or "json"
+            path: Catalog file to ingest
+
+        Returns:
+            The new job; its ``task`` can be awaited
+
+        Raises:
+            IngestionInProgressError: If another job is still active
+        """
+        if source not in ("pdf", "json"):
+            raise ValueError(f"Unknown ingestion source {source!r}")
+        # Check-and-set without an await in between, so it is atomic on the loop
+        if self.active_job is not None:
+            raise IngestionInProgressError(self.active_job)
+
+        job = IngestionJob(id=uuid.uuid4().hex, source=source, path=path)
+        self.active_job = job
+        self.jobs[job.id] = job
+        self._trim_history()
+
+        job.task = asyncio.create_task(self._run(job))
+        job.task.add_done_callback(lambda _: self._release(job))
+        logger.info(f"Started ingestion job {job.id} ({source}: {path})")
+        return job
+
+    async def _run(self, job: IngestionJob) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            if job.source == "pdf":
+                courses = await data_ingestion_service.process_catalog(job.path, job.progress)
+            else:
+                courses = await data_ingestion_service.process_json_catalog(job.path, job.progress)
+
+            job.courses = len(courses)
+            job.status = JobStatus.FAILED if job.progress.errors and not courses else JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.status = JobStatus.CANCELLED
+            logger.info(f"Ingestion job {job.id} cancelled")
+            self._release(job)
+            # Let the task end up cancelled, so awaiting it tells the two apart
+            raise
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.progress.errors.append(str(e))
+            logger.error(f"Ingestion job {job.id} failed: {e}")
+        finally:
+            job.progress.phase = job.status.value
+            job.finished_at = datetime.utcnow()
+            logger.info(f"Ingestion job {job.id} {job.status.value}: {job.progress.as_dict()}")
+
+    def _release(self, job: IngestionJob) -> None:
+        # Also reached when a job is cancelled before it ever started running
+        if job.status not in FINISHED_STATUSES:
+            job.status = JobStatus.CANCELLED
+            job.progress.phase = job.status.value
+            job.finished_at = datetime.utcnow()
+        if self.active_job is job:
+            self.active_job = None
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Return a job by id, if it is still known."""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[IngestionJob]:
+        """Return known jobs, newest first."""
+        return list(reversed(self.jobs.values()))
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation of a running job.
+
+        Returns:
+            bool: True if the job was running and has been told to stop
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES or job.task is None:
+            return False
+        return job.task.cancel()
+
+    async def shutdown(self) -> None:
+        """Cancel the active job, if any, and wait for it to stop."""
+        job = self.active_job
+        if job is None or job.task is None:
+            return
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return the active job and ingestion thread pool statistics."""
+        return {
+            'active_job': self.active_job.id if self.active_job else None,
+            'jobs_tracked': len(self.jobs),
+            'executor': data_ingestion_service.executor.get_stats()
+        }
+
+    def _trim_history(self) -> None:
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= max(1, settings.INGESTION_JOB_HISTORY):
+                break
+            if self.jobs[job_id].status in FINISHED_STATUSES:
+                del self.jobs[job_id]
+
+# Singleton instance
+ingestion_jobs = IngestionJobManager()
@@ -0,0 +1,116 @@
+import os
+import logging
+import threading
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Process-wide cache of loaded embedding models, keyed by model name.
+
+    Every service that needs an encoder gets it from here, so each model's
+    weights are loaded once per process no matter how many services use it.
+    """
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModelRegistry, cls).__new__(cls)
+            cls._instance._models = {}
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+    
+    def get_embedding_model(self, model_name: Optional[str] = None, backend: Optional[str] = None):
+        """Return the shared encoder for ``model_name``, loading it on first use.
+        
+        Args:
+            model_name: Model to load; defaults to ``settings.EMBEDDING_MODEL``
+            backend: "torch" or "onnx"; defaults to ``settings.EMBEDDING_BACKEND``
+            
+        Returns:
+            The shared SentenceTransformer, or an OnnxEmbeddingEncoder exposing
+            the same ``encode`` interface
+        """
+        name = model_name or settings.EMBEDDING_MODEL
+        backend = (backend or settings.EMBEDDING_BACKEND).lower()
+        with self._lock:
+            model = self._models.get((name, backend))
+            if model is None:
+                if backend == "onnx":
+                    try:
+                        model = self._load_onnx(name)
+                    except Exception as e:
+                        logger.warning(f"ONNX backend unavailable for {name}, using torch: {e}")
+                        model = self._load_torch(name)
+                else:
+                    model = self._load_torch(name)
+                self._models[(name, backend)] = model
+            return model
+    
+    def get_encoder(self):
+        """Return the encoder services should embed with.
+        
+        This is the shared worker pool when ``settings.EMBEDDING_WORKERS`` is
+        set, started on first use, and the in-process model otherwise. Both
+        expose the same ``encode`` interface.
+        """
+        if settings.EMBEDDING_WORKERS > 0:
+            from .embedding_pool import embedding_pool
+            embedding_pool.start()
+            return embedding_pool
+        return self.get_embedding_model()
+    
+    def _load_torch(self, name: str) -> "SentenceTransformer":
+        model = self._models.get((name, "torch"))
+        if model is None:
+            logger.info(f"Loading embedding model {name}...")
+            # Imported here so that importing the app doesn't pull in torch
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(name)
+            self._models[(name, "torch")] = model
+        return model
+    
+    def _load_onnx(self, name: str):
+        from .onnx_encoder import OnnxEmbeddingEncoder, embedding_parity
+        
+        quantize = settings.EMBEDDING_ONNX_QUANTIZE
+        model_dir = self.onnx_model_dir(name)
+        model_file = OnnxEmbeddingEncoder.INT8_FILE if quantize else OnnxEmbeddingEncoder.FP32_FILE
+        
+        if os.path.exists(os.path.join(model_dir, model_file)):
+            logger.info(f"Loading ONNX embedding model from {model_dir}...")
+            return OnnxEmbeddingEncoder(model_dir, quantized=quantize)
+        
+        # First use: export from the torch model and check the result matches it.
+        # The reference model is not kept, so torch memory is released afterwards.
+        from sentence_transformers import SentenceTransformer
+        reference = SentenceTransformer(name, device="cpu")
+        OnnxEmbeddingEncoder.export(reference, model_dir, quantize=quantize)
+        model = OnnxEmbeddingEncoder(model_dir, quantized=quantize)
+        
+        parity = embedding_parity(reference, model)
+        logger.info(f"ONNX parity vs torch for {name}: min cosine {parity:.4f}")
+        if parity < settings.EMBEDDING_ONNX_MIN_PARITY:
+            os.remove(model.model_path)
+            raise RuntimeError(
+                f"exported model parity {parity:.4f} is below {settings.EMBEDDING_ONNX_MIN_PARITY}"
+            )
+        return model
+    
+    @staticmethod
+    def onnx_model_dir(name: str) -> str:
+        """Directory holding the exported ONNX files for ``name``."""
+        base_dir = settings.ONNX_MODEL_DIR or os.path.join(os.path.dirname(__file__), '../../data/onnx')
+        return os.path.join(base_dir, name.replace('/', '__'))
+    
+    def loaded_models(self) -> Dict[str, Any]:
+        """Return the names of the models loaded so far."""
+        return {'embedding_models': [f"{name} ({backend})" for name, backend in self._models.keys()]}
+
+# Singleton instance
+model_registry = ModelRegistry()
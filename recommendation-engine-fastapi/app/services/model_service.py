@@ -1,14 +1,21 @@
+import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional, Tuple
-from sentence_transformers import SentenceTransformer
 import numpy as np
-import spacy
 from datetime import datetime
 import json
 from enum import Enum
 from dataclasses import dataclass
 import random
+import time
+
+from ..config import settings
+from ..utils.cache import LRUCache
+from ..utils.batching import MicroBatcher
+from ..utils.metrics import LatencyStats
+from ..utils.keyword_matcher import KeywordMatcher, KeywordScan
+from .model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +26,28 @@ class IntentType(Enum):
     COMPARE = "compare"
     UNKNOWN = "unknown"
 
+# Marker words for each intent; matched as whole words, so inflections are listed
+INTENT_MARKERS = {
+    IntentType.LEARN: ['how to', 'learn', 'learning', 'tutorial', 'guide'],
+    IntentType.BUILD: ['build', 'building', 'create', 'creating', 'make', 'making', 'develop', 'developing'],
+    IntentType.COMPARE: ['compare', 'comparing', 'vs', 'versus', 'difference'],
+    IntentType.EXPLORE: ['explore', 'exploring', 'discover', 'find', 'find out', 'check', 'search', 'look for'],
+}
+
+LEVEL_MARKERS = {
+    'beginner': ['beginner', 'beginners', 'basic', 'basics', 'introduction', 'getting started'],
+    'intermediate': ['intermediate', 'medium'],
+    'advanced': ['advanced', 'expert', 'master'],
+}
+
+# General technology terms recognised as keywords without mapping to a category
+GENERAL_TECH_TERMS = ['nodejs', 'backend', 'frontend', 'fullstack', 'api', 'database', 'web', 'mobile']
+
+# Intent checked first wins: NLP parsing favours LEARN, fallback parsing
+# only returns LEARN when nothing else matched
+NLP_INTENT_PRECEDENCE = [IntentType.LEARN, IntentType.BUILD, IntentType.COMPARE, IntentType.EXPLORE]
+FALLBACK_INTENT_PRECEDENCE = [IntentType.BUILD, IntentType.EXPLORE, IntentType.COMPARE]
+
 @dataclass
 class ParsedIntent:
     intent_type: IntentType
@@ -26,48 +55,163 @@ class ParsedIntent:
     level: str
     keywords: List[str]
 
+class ModelStatus(Enum):
+    NOT_LOADED = "not_loaded"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
 class ModelService:
     _instance = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ModelService, cls).__new__(cls)
-            cls._instance._initialize()
+            cls._instance._setup()
         return cls._instance
     
-    def _initialize(self):
-        """Initialize the model service with required models."""
+    def _setup(self):
+        """Set up service state without loading any models.
+        
+        Models are loaded by ``initialize()`` so that importing this module
+        stays cheap and never pulls in torch or spaCy.
+        """
         self.embedding_model = None
         self.nlp = None
-        self.is_initialized = False
+        self.status = ModelStatus.NOT_LOADED
+        self._init_lock = asyncio.Lock()
+        self.embedding_cache = LRUCache(max_size=settings.MODEL_CACHE_SIZE)
+        self.embedding_batcher = MicroBatcher(
+            name="embedding-batcher",
+            process_batch=self._encode_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        )
+        self.nlp_batcher = MicroBatcher(
+            name="nlp-batcher",
+            process_batch=self._analyze_texts,
+            max_batch_size=settings.NLP_BATCH_MAX_SIZE,
+            max_wait_ms=settings.NLP_BATCH_MAX_WAIT_MS
+        )
+        self.parse_time = LatencyStats()
+        self.topic_categories: List[str] = []
+        self.topic_matrix: Optional[np.ndarray] = None
+        self.topic_row_category: Optional[np.ndarray] = None
         
+        # Load skill keywords and categories
+        self._load_skill_keywords()
+    
+    @property
+    def is_initialized(self) -> bool:
+        """Whether the models are loaded and ready to serve."""
+        return self.status == ModelStatus.READY
+    
+    def _load_models(self):
+        """Load the embedding model and NLP pipeline (blocking)."""
+        # Initialize embedding model
+        logger.info("Loading embedding model...")
+        self.embedding_model = model_registry.get_encoder()
+        self._build_topic_index()
+        
+        # Initialize NLP pipeline for intent parsing
+        logger.info("Loading NLP pipeline...")
+        try:
+            import spacy
+            self.nlp = spacy.load("en_core_web_sm")
+        except (ImportError, OSError):
+            logger.warning("spaCy model 'en_core_web_sm' not found. Using basic text processing.")
+            self.nlp = None
+    
+    def _build_topic_index(self):
+        """Embed every skill keyword and category centroid once.
+        
+        Rows of ``topic_matrix`` are the per-category centroids followed by the
+        individual keyword embeddings; ``topic_row_category`` maps each row to
+        its category, so a query is classified with one matrix-vector product.
+        """
         try:
-            # Initialize embedding model
-            logger.info("Loading embedding model...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            categories = list(self.skill_keywords.keys())
+            rows = [
+                (index, keyword)
+                for index, category in enumerate(categories)
+                for keyword in self.skill_keywords[category]
+            ]
+            if not rows:
+                return
             
-            # Initialize NLP pipeline for intent parsing
-            logger.info("Loading NLP pipeline...")
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except OSError:
-                logger.warning("spaCy model 'en_core_web_sm' not found. Using basic text processing.")
-                self.nlp = None
+            keyword_embeddings = np.asarray(
+                self.embedding_model.encode(
+                    [keyword for _, keyword in rows],
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                ),
+                dtype=np.float32
+            )
+            keyword_categories = np.array([index for index, _ in rows], dtype=np.intp)
             
-            # Load skill keywords and categories
-            self._load_skill_keywords()
+            centroids = np.zeros((len(categories), keyword_embeddings.shape[1]), dtype=np.float32)
+            np.add.at(centroids, keyword_categories, keyword_embeddings)
+            centroids /= np.clip(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12, None)
             
-            logger.info("Model service initialized successfully")
-            self.is_initialized = True
+            self.topic_categories = categories
+            self.topic_matrix = np.ascontiguousarray(np.vstack([centroids, keyword_embeddings]))
+            self.topic_row_category = np.concatenate([np.arange(len(categories)), keyword_categories])
+            logger.info(f"Built topic index: {len(categories)} categories, {len(rows)} keywords")
+        except Exception as e:
+            logger.warning(f"Failed to build topic index, using keyword topics only: {e}")
+            self.topic_matrix = None
+    
+    def classify_topics(self, query_embedding: List[float]) -> List[str]:
+        """Return the skill categories a query embedding is close to, best first.
+        
+        A category scores the best of its centroid and its keywords' similarity.
+        
+        Args:
+            query_embedding: Normalized query embedding
             
+        Returns:
+            Categories scoring at least ``settings.TOPIC_SIMILARITY_THRESHOLD``
+        """
+        if self.topic_matrix is None:
+            return []
+        
+        scores = self.topic_matrix @ np.asarray(query_embedding, dtype=np.float32)
+        category_scores = np.full(len(self.topic_categories), -1.0, dtype=np.float32)
+        np.maximum.at(category_scores, self.topic_row_category, scores)
+        
+        selected = np.nonzero(category_scores >= settings.TOPIC_SIMILARITY_THRESHOLD)[0]
+        selected = selected[np.argsort(-category_scores[selected])]
+        return [self.topic_categories[i] for i in selected]
+    
+    async def _semantic_topics(self, text: str) -> List[str]:
+        """Classify ``text`` against the topic index, reusing its cached embedding."""
+        if self.topic_matrix is None or not self.is_initialized:
+            return []
+        try:
+            return self.classify_topics(await self.generate_embedding(text))
         except Exception as e:
-            logger.error(f"Failed to initialize models: {e}")
-            self.is_initialized = False
+            logger.warning(f"Semantic topic classification failed: {e}")
+            return []
     
     async def initialize(self):
-        """Async initialization method."""
-        if not self.is_initialized:
-            self._initialize()
+        """Load the models once, off the event loop.
+        
+        Concurrent callers wait on the same load; once the service is ready
+        further calls return immediately.
+        """
+        async with self._init_lock:
+            if self.is_initialized:
+                return
+            
+            self.status = ModelStatus.LOADING
+            try:
+                await asyncio.to_thread(self._load_models)
+                self.status = ModelStatus.READY
+                logger.info("Model service initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize models: {e}")
+                self.status = ModelStatus.FAILED
     
     def _load_skill_keywords(self):
         """Load skill keywords and categories from a JSON file."""
@@ -85,6 +229,11 @@ class ModelService:
                 'marketing': ['digital marketing', 'seo', 'social media', 'content marketing', 'email marketing'],
             }
             
+            # User-facing names of the category slugs
+            self.category_names = {
+                category: category.replace('_', ' ').title() for category in self.skill_keywords
+            }
+            
             # Create a reverse mapping for faster lookups
             self.keyword_to_category = {}
             for category, keywords in self.skill_keywords.items():
@@ -94,7 +243,29 @@ class ModelService:
         except Exception as e:
             logger.error(f"Failed to load skill keywords: {e}")
             self.skill_keywords = {}
+            self.category_names = {}
             self.keyword_to_category = {}
+        
+        self.keyword_matcher = self._build_keyword_matcher()
+    
+    def _build_keyword_matcher(self) -> KeywordMatcher:
+        """Compile skill keywords, intent and level markers into one matcher."""
+        entries = []
+        for category, keywords in self.skill_keywords.items():
+            for keyword in keywords:
+                entries.append((keyword, 'keyword', keyword))
+                entries.append((keyword, 'category', category))
+        for term in GENERAL_TECH_TERMS:
+            entries.append((term, 'keyword', term))
+        for intent_type, markers in INTENT_MARKERS.items():
+            entries.extend((marker, 'intent', intent_type) for marker in markers)
+        for level, markers in LEVEL_MARKERS.items():
+            entries.extend((marker, 'level', level) for marker in markers)
+        return KeywordMatcher(entries)
+    
+    def scan_keywords(self, text: str) -> KeywordScan:
+        """Find skill keywords, categories, intent and level markers in one pass."""
+        return self.keyword_matcher.scan(text)
     
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate an embedding for the given text.
@@ -108,21 +279,85 @@ class ModelService:
         if not self.is_initialized or not self.embedding_model:
             raise RuntimeError("Model service not initialized")
         
+        # all-MiniLM-L6-v2 is uncased and ignores extra whitespace, so the
+        # normalized text embeds identically and makes a better cache key
+        cache_key = self._normalize_text(text)
+        cached = self.embedding_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            # Generate embedding using Sentence Transformers
-            embedding = self.embedding_model.encode(
-                text,
-                convert_to_numpy=True,
-                normalize_embeddings=True,
-                show_progress_bar=False
-            )
-            
-            return embedding.tolist()
+            # Concurrent requests are encoded together in one batched call
+            values = await self.embedding_batcher.submit(cache_key)
+            self.embedding_cache.set(cache_key, values)
+            return list(values)
             
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise
     
+    async def generate_embeddings(self, texts: List[str], use_cache: bool = True) -> List[List[float]]:
+        """Generate embeddings for several texts with at most one model call.
+        
+        Args:
+            texts: The texts to embed
+            use_cache: Read and populate the query embedding cache
+            
+        Returns:
+            One embedding per input text, in order
+        """
+        if not self.is_initialized or not self.embedding_model:
+            raise RuntimeError("Model service not initialized")
+        
+        keys = [self._normalize_text(text) for text in texts]
+        rows: Dict[str, List[float]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            cached = self.embedding_cache.get(key) if use_cache else None
+            if cached is not None:
+                rows[key] = cached
+            else:
+                missing.append(key)
+        
+        if missing:
+            encoded = await asyncio.to_thread(self._encode_batch, missing)
+            for key, values in zip(missing, encoded):
+                rows[key] = values
+                if use_cache:
+                    self.embedding_cache.set(key, values)
+        
+        return [list(rows[key]) for key in keys]
+    
+    def _encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """Encode a batch of texts with one model call, one row per input."""
+        unique_texts = list(dict.fromkeys(texts))
+        embeddings = self.embedding_model.encode(
+            unique_texts,
+            batch_size=len(unique_texts),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        rows = dict(zip(unique_texts, embeddings.tolist()))
+        return [rows[text] for text in texts]
+    
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Lowercase and collapse whitespace."""
+        return " ".join(text.lower().split())
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache and batching statistics for the model service."""
+        metrics = {
+            'embedding_cache': self.embedding_cache.get_stats(),
+            'embedding_batcher': self.embedding_batcher.get_stats(),
+            'nlp_batcher': self.nlp_batcher.get_stats(),
+            'parse_time': self.parse_time.snapshot()
+        }
+        if hasattr(self.embedding_model, 'get_stats'):
+            metrics['embedding_pool'] = self.embedding_model.get_stats()
+        return metrics
+    
     async def parse_intent(self, text: str) -> Dict[str, Any]:
         """Parse user intent from the given text.
         
@@ -130,92 +365,113 @@ class ModelService:
             text: The user's input text
             
         Returns:
-            Dictionary containing the parsed intent
+            Dictionary containing the parsed intent. ``parsed_with`` is "nlp"
+            when the full spaCy path ran and "fallback" when only keyword
+            matching did (spaCy not loaded, or it failed).
         """
+        started_at = time.perf_counter()
         try:
+            # The vector search embeds the same text at the same time; the
+            # embedding batcher encodes it once for both (and the cache serves
+            # it afterwards), so classifying it costs one small matrix product.
+            # It runs alongside the spaCy parse rather than before it.
             if self.nlp:
-                return await self._parse_with_nlp(text)
+                semantic_topics, analysis = await asyncio.gather(
+                    self._semantic_topics(text),
+                    self.nlp_batcher.submit(text.lower())
+                )
+                return {**self._parse_with_nlp(text, analysis, semantic_topics), 'parsed_with': 'nlp'}
             else:
-                return self._parse_with_fallback(text)
+                semantic_topics = await self._semantic_topics(text)
+                return {**self._parse_with_fallback(text, semantic_topics), 'parsed_with': 'fallback'}
                 
         except Exception as e:
             logger.error(f"Intent parsing failed: {e}")
-            return self._parse_with_fallback(text)
+            return {**self._parse_with_fallback(text), 'parsed_with': 'fallback'}
+        finally:
+            self.parse_time.record(time.perf_counter() - started_at)
     
-    async def _parse_with_nlp(self, text: str) -> Dict[str, Any]:
-        """Parse intent using spaCy NLP."""
-        doc = self.nlp(text.lower())
+    def _analyze_texts(self, texts: List[str]) -> List[Tuple[List[str], List[str], List[tuple]]]:
+        """Run a batch of texts through spaCy with one ``nlp.pipe`` call.
         
-        # Extract named entities and noun phrases
-        entities = [ent.text for ent in doc.ents]
-        noun_chunks = [chunk.text for chunk in doc.noun_chunks]
+        Returns:
+            One (entities, noun_chunks, tokens) tuple per text, where tokens
+            are (text, pos, lemma) triples
+        """
+        analyses = []
+        for doc in self.nlp.pipe(texts, batch_size=len(texts)):
+            # Extract named entities and noun phrases
+            entities = [ent.text for ent in doc.ents]
+            noun_chunks = [chunk.text for chunk in doc.noun_chunks]
+            
+            # Extract tokens and their parts of speech
+            tokens = [(token.text, token.pos_, token.lemma_) for token in doc]
+            analyses.append((entities, noun_chunks, tokens))
+        return analyses
+    
+    def _parse_with_nlp(
+        self,
+        text: str,
+        analysis: Tuple[List[str], List[str], List[tuple]],
+        semantic_topics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Parse intent from the spaCy analysis of ``text`` (see ``_analyze_texts``)."""
+        entities, noun_chunks, tokens = analysis
         
-        # Extract tokens and their parts of speech
-        tokens = [(token.text, token.pos_, token.lemma_) for token in doc]
+        scan = self.scan_keywords(text)
         
         # Determine intent type
-        intent_type = self._determine_intent_type(text, tokens)
+        intent_type = self._determine_intent_type(scan, NLP_INTENT_PRECEDENCE)
         
         # Extract topics and keywords
         topics = self._extract_topics(entities, noun_chunks)
         keywords = self._extract_keywords(tokens, entities, noun_chunks)
         
         # Determine skill level
-        level = self._determine_skill_level(text)
+        level = self._determine_skill_level(scan)
         
         return {
             'level': level,
             'keywords': keywords[:5],  # Limit keywords
             'topics': topics[:3],      # Limit topics
+            'categories': self._category_names(semantic_topics or [])[:3],
             'intent_type': intent_type.value
         }
     
-    def _parse_with_fallback(self, text: str) -> Dict[str, Any]:
+    def _parse_with_fallback(self, text: str, semantic_topics: Optional[List[str]] = None) -> Dict[str, Any]:
         """Simple fallback intent parsing without spaCy."""
-        text_lower = text.lower()
+        scan = self.scan_keywords(text)
         
         # Determine intent type based on keywords
-        intent_type = IntentType.LEARN  # default
-        if any(word in text_lower for word in ['build', 'create', 'develop', 'make']):
-            intent_type = IntentType.BUILD
-        elif any(word in text_lower for word in ['explore', 'discover', 'find out', 'check']):
-            intent_type = IntentType.EXPLORE
-        elif any(word in text_lower for word in ['compare', 'vs', 'versus', 'difference']):
-            intent_type = IntentType.COMPARE
+        intent_type = self._determine_intent_type(scan, FALLBACK_INTENT_PRECEDENCE)
         
         # Extract level
-        level = self._determine_skill_level(text)
+        level = self._determine_skill_level(scan)
         
-        # Extract keywords using simple word matching
-        tech_keywords = [kw for kw in self.keyword_to_category.keys() if kw in text_lower]
+        # Keywords and their categories come from the same scan
+        tech_keywords = scan.values('keyword')
+        topics = self._category_names(scan.values('category'))
         
-        # Extract topics from categories
-        topics = []
-        for keyword in tech_keywords:
-            category = self.keyword_to_category.get(keyword)
-            if category and category not in topics:
-                topics.append(category)
+        # Categories also include those the query is semantically close to
+        categories = self._category_names(list(scan.values('category')) + list(semantic_topics or []))
         
         return {
             'level': level,
             'keywords': tech_keywords[:5],
             'topics': topics[:3],
+            'categories': categories[:3],
             'intent_type': intent_type.value
         }
     
-    def _determine_intent_type(self, text: str, tokens: List[tuple]) -> IntentType:
-        """Determine the intent type from the text."""
-        text_lower = text.lower()
-        
-        # Check for intent indicators
-        if any(word in text_lower for word in ["how to", "learn", "tutorial", "guide"]):
-            return IntentType.LEARN
-        elif any(word in text_lower for word in ["build", "create", "make", "develop"]):
-            return IntentType.BUILD
-        elif any(word in text_lower for word in ["compare", "vs", "difference between"]):
-            return IntentType.COMPARE
-        elif any(word in text_lower for word in ["explore", "find", "search", "look for"]):
-            return IntentType.EXPLORE
+    def _category_names(self, categories: List[str]) -> List[str]:
+        """Map category slugs to their user-facing names, dropping duplicates."""
+        return list(dict.fromkeys(self.category_names.get(category, category) for category in categories))
+    
+    def _determine_intent_type(self, scan: KeywordScan, precedence: List[IntentType]) -> IntentType:
+        """Determine the intent type from the markers found in the text."""
+        for intent_type in precedence:
+            if scan.has('intent', intent_type):
+                return intent_type
         
         # Default to LEARN if we can't determine the intent
         return IntentType.LEARN
@@ -258,14 +514,11 @@ class ModelService:
         # Limit the number of keywords to avoid overwhelming the system
         return list(keywords)[:10]
     
-    def _determine_skill_level(self, text: str) -> str:
-        """Determine the skill level from the text."""
-        text_lower = text.lower()
-        
-        # Check for skill level indicators
-        if any(word in text_lower for word in ["beginner", "basic", "introduction", "getting started"]):
+    def _determine_skill_level(self, scan: KeywordScan) -> str:
+        """Determine the skill level from the markers found in the text."""
+        if scan.has('level', 'beginner'):
             return "beginner"
-        elif any(word in text_lower for word in ["intermediate", "advanced", "expert", "master"]):
+        elif scan.has('level', 'intermediate') or scan.has('level', 'advanced'):
             return "advanced"
         
         # Default to beginner if we can't determine the level
@@ -0,0 +1,250 @@
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class NumpyVectorIndex:
+    """In-process exact-search index with a ChromaDB-collection-like interface.
+
+    Embeddings are stored L2-normalized in one contiguous float32 matrix, so a
+    query is scored with a single matrix-vector product and the top-k rows are
+    selected with argpartition. Results use Chroma's cosine distance
+    (1 - similarity) so callers can treat both backends the same way.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        # Readers grab this tuple once; writers replace it wholesale.
+        self._state = (np.zeros((0, 0), dtype=np.float32), [], [], [])
+
+    def count(self) -> int:
+        """Get the number of documents in the index."""
+        return len(self._state[1])
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ) -> None:
+        """Add documents to the index, skipping ids that already exist."""
+        if not ids:
+            return
+
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or ['' for _ in ids]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            matrix, current_ids, current_metadatas, current_documents = self._state
+
+            if matrix.size and vectors.shape[1] != matrix.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match index dimension {matrix.shape[1]}"
+                )
+
+            existing = set(current_ids)
+            keep = []
+            for i, doc_id in enumerate(ids):
+                if doc_id in existing:
+                    logger.warning(f"Document {doc_id} already exists in {self.name}, skipping")
+                    continue
+                existing.add(doc_id)
+                keep.append(i)
+
+            if not keep:
+                return
+
+            new_rows = vectors[keep]
+            matrix = np.vstack([matrix, new_rows]) if matrix.size else new_rows
+            self._state = (
+                np.ascontiguousarray(matrix),
+                current_ids + [ids[i] for i in keep],
+                current_metadatas + [metadatas[i] for i in keep],
+                current_documents + [documents[i] for i in keep]
+            )
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None
+    ) -> None:
+        """Insert new documents and overwrite existing ones in place."""
+        if not ids:
+            return
+
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or ['' for _ in ids]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            matrix, current_ids, current_metadatas, current_documents = self._state
+
+            if matrix.size and vectors.shape[1] != matrix.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match index dimension {matrix.shape[1]}"
+                )
+
+            matrix = matrix.copy() if matrix.size else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            current_ids = list(current_ids)
+            current_metadatas = list(current_metadatas)
+            current_documents = list(current_documents)
+            positions = {doc_id: i for i, doc_id in enumerate(current_ids)}
+
+            appended = []
+            for i, doc_id in enumerate(ids):
+                row = positions.get(doc_id)
+                if row is None:
+                    positions[doc_id] = len(current_ids)
+                    current_ids.append(doc_id)
+                    current_metadatas.append(metadatas[i])
+                    current_documents.append(documents[i])
+                    appended.append(vectors[i])
+                elif row >= matrix.shape[0]:
+                    # Repeated id within this call: overwrite the pending row
+                    appended[row - matrix.shape[0]] = vectors[i]
+                    current_metadatas[row] = metadatas[i]
+                    current_documents[row] = documents[i]
+                else:
+                    matrix[row] = vectors[i]
+                    current_metadatas[row] = metadatas[i]
+                    current_documents[row] = documents[i]
+
+            if appended:
+                matrix = np.vstack([matrix, np.asarray(appended, dtype=np.float32)])
+            self._state = (np.ascontiguousarray(matrix), current_ids, current_metadatas, current_documents)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """Return stored documents, all of them or only ``ids``.
+
+        Args:
+            ids: Document ids to fetch; all documents when omitted
+            include: Any of "metadatas", "documents", "embeddings"; defaults
+                to metadatas and documents, like Chroma
+
+        Returns:
+            Chroma-style dict with ``ids`` and the requested fields
+        """
+        matrix, current_ids, metadatas, documents = self._state
+        include = include if include is not None else ['metadatas', 'documents']
+
+        if ids is None:
+            rows = list(range(len(current_ids)))
+        else:
+            positions = {doc_id: i for i, doc_id in enumerate(current_ids)}
+            rows = [positions[doc_id] for doc_id in ids if doc_id in positions]
+
+        result = {'ids': [current_ids[i] for i in rows]}
+        if 'metadatas' in include:
+            result['metadatas'] = [metadatas[i] for i in rows]
+        if 'documents' in include:
+            result['documents'] = [documents[i] for i in rows]
+        if 'embeddings' in include:
+            result['embeddings'] = matrix[rows].tolist() if rows else []
+        return result
+
+    def delete(self, ids: List[str]) -> None:
+        """Remove documents by id; unknown ids are ignored."""
+        if not ids:
+            return
+
+        with self._lock:
+            matrix, current_ids, metadatas, documents = self._state
+            removed = set(ids)
+            keep = [i for i, doc_id in enumerate(current_ids) if doc_id not in removed]
+            if len(keep) == len(current_ids):
+                return
+            self._state = (
+                np.ascontiguousarray(matrix[keep]) if matrix.size else matrix,
+                [current_ids[i] for i in keep],
+                [metadatas[i] for i in keep],
+                [documents[i] for i in keep]
+            )
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Return the nearest documents for each query embedding.
+
+        Args:
+            query_embeddings: One embedding per query
+            n_results: Number of results to return per query
+            where: Optional metadata filter (equality, ``$eq``, ``$in`` or ``$and``)
+
+        Returns:
+            Chroma-style result dict with ``ids``, ``distances``, ``metadatas``
+            and ``documents`` lists, one inner list per query
+        """
+        matrix, ids, metadatas, documents = self._state
+        results = {'ids': [], 'distances': [], 'metadatas': [], 'documents': []}
+
+        candidates = np.arange(len(ids))
+        if where:
+            candidates = np.array(
+                [i for i, metadata in enumerate(metadatas) if self._matches(metadata, where)],
+                dtype=np.intp
+            )
+
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        for query in queries:
+            if not candidates.size or n_results <= 0:
+                for key in results:
+                    results[key].append([])
+                continue
+
+            scores = matrix[candidates] @ query if where else matrix @ query
+            k = min(n_results, scores.shape[0])
+            if k < scores.shape[0]:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(scores.shape[0])
+            top = top[np.argsort(-scores[top])]
+            rows = candidates[top]
+
+            results['ids'].append([ids[i] for i in rows])
+            results['distances'].append((1.0 - scores[top]).tolist())
+            results['metadatas'].append([metadatas[i] for i in rows])
+            results['documents'].append([documents[i] for i in rows])
+
+        return results
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows, leaving all-zero rows untouched."""
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @classmethod
+    def _matches(cls, metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+        """Evaluate a Chroma-style ``where`` filter against one metadata dict."""
+        for key, condition in where.items():
+            if key == '$and':
+                if not all(cls._matches(metadata, clause) for clause in condition):
+                    return False
+                continue
+
+            value = metadata.get(key)
+            if isinstance(condition, dict):
+                if '$eq' in condition and value != condition['$eq']:
+                    return False
+                if '$in' in condition and value not in condition['$in']:
+                    return False
+            elif value != condition:
+                return False
+        return True
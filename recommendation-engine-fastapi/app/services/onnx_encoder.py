@@ -0,0 +1,161 @@
+import os
+import logging
+from typing import List, Union, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Short queries representative of production traffic, used for the parity check
+PARITY_SAMPLE_TEXTS = [
+    "python beginner",
+    "backend nodejs",
+    "I want to be a backend engineer and I'm interested in Node.js",
+    "machine learning with tensorflow for data science",
+    "How to become a Python backend developer",
+    "advanced react native mobile development course",
+]
+
+class OnnxEmbeddingEncoder:
+    """Sentence encoder that runs an exported transformer with onnxruntime.
+
+    Reproduces the all-MiniLM-L6-v2 SentenceTransformer pipeline (transformer,
+    mean pooling, optional L2 normalization) without loading torch, and accepts
+    the subset of ``SentenceTransformer.encode`` arguments this app uses, so it
+    can stand in for the torch model anywhere.
+    """
+
+    FP32_FILE = "model.onnx"
+    INT8_FILE = "model.int8.onnx"
+
+    def __init__(self, model_dir: str, quantized: bool = False, max_seq_length: int = 256):
+        """Load an exported model from ``model_dir``."""
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_file = self.INT8_FILE if quantized else self.FP32_FILE
+        self.model_path = os.path.join(model_dir, model_file)
+        self.quantized = quantized
+        self.max_seq_length = max_seq_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            self.model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def export(cls, st_model, model_dir: str, quantize: bool = False) -> None:
+        """Export a loaded SentenceTransformer to ONNX, with an optional int8 copy.
+
+        Exporting needs torch; loading the exported model later does not.
+
+        Args:
+            st_model: The SentenceTransformer whose transformer is exported
+            model_dir: Directory for the ONNX files and tokenizer
+            quantize: Also write a dynamically int8-quantized copy
+        """
+        import torch
+
+        os.makedirs(model_dir, exist_ok=True)
+        fp32_path = os.path.join(model_dir, cls.FP32_FILE)
+
+        if not os.path.exists(fp32_path):
+            logger.info(f"Exporting embedding model to ONNX at {fp32_path}...")
+            transformer = st_model[0].auto_model.eval()
+            tokenizer = st_model.tokenizer
+
+            dummy = tokenizer(["export sample"], return_tensors="pt")
+            input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+            dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+            with torch.no_grad():
+                torch.onnx.export(
+                    transformer,
+                    tuple(dummy[name] for name in input_names),
+                    fp32_path,
+                    input_names=input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                    do_constant_folding=True
+                )
+            tokenizer.save_pretrained(model_dir)
+
+        int8_path = os.path.join(model_dir, cls.INT8_FILE)
+        if quantize and not os.path.exists(int8_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            logger.info(f"Quantizing ONNX model to int8 at {int8_path}...")
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        show_progress_bar: bool = False
+    ) -> np.ndarray:
+        """Encode one text or a list of texts.
+
+        Returns:
+            A float32 array of shape (dim,) for a single string, or (n, dim)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        batch_size = max(1, batch_size)
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            chunks.append(self._encode_chunk(texts[start:start + batch_size]))
+        embeddings = np.vstack(chunks)
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_chunk(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        feeds = {
+            name: value.astype(np.int64)
+            for name, value in encoded.items()
+            if name in self._input_names
+        }
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = encoded["attention_mask"][..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        return (summed / counts).astype(np.float32)
+
+def embedding_parity(reference_model, candidate_model, texts: Optional[List[str]] = None) -> float:
+    """Return the lowest cosine similarity between two encoders' embeddings.
+
+    Args:
+        reference_model: The encoder to compare against (usually the torch model)
+        candidate_model: The encoder being validated
+        texts: Texts to embed; defaults to ``PARITY_SAMPLE_TEXTS``
+
+    Returns:
+        The minimum per-text cosine similarity
+    """
+    texts = texts or PARITY_SAMPLE_TEXTS
+    reference = reference_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    candidate = candidate_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    return float(np.min(np.sum(reference * candidate, axis=1)))
@@ -0,0 +1,100 @@
+import logging
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List
+
+logger = logging.getLogger(__name__)
+
+def count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF without extracting any text."""
+    import PyPDF2
+
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages ``[start, stop)``, one string per page.
+
+    pdfplumber handles structured layouts better, so it is tried first; a page
+    it returns nothing for is re-read with PyPDF2. A page that fails with both
+    comes back as an empty string so page numbering stays intact.
+    """
+    import pdfplumber
+    import PyPDF2
+
+    pages = []
+    fallback_reader = None
+    fallback_file = None
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_number in range(start, min(stop, len(pdf.pages))):
+                text = ""
+                try:
+                    text = pdf.pages[page_number].extract_text() or ""
+                except Exception as e:
+                    logger.warning(f"pdfplumber failed on page {page_number + 1} of {pdf_path}: {e}")
+
+                if not text.strip():
+                    try:
+                        if fallback_reader is None:
+                            fallback_file = open(pdf_path, 'rb')
+                            fallback_reader = PyPDF2.PdfReader(fallback_file)
+                        text = fallback_reader.pages[page_number].extract_text() or ""
+                    except Exception as e:
+                        logger.warning(f"PyPDF2 failed on page {page_number + 1} of {pdf_path}: {e}")
+
+                pages.append(text)
+    finally:
+        if fallback_file is not None:
+            fallback_file.close()
+
+    return pages
+
+def iter_pdf_pages(
+    pdf_path: str,
+    max_workers: int = 1,
+    pages_per_task: int = 8
+) -> Iterator[str]:
+    """Yield the text of every page of a PDF, in page order.
+
+    Pages are extracted in chunks of ``pages_per_task`` across a process pool.
+    At most two chunks per worker are in flight at once, so memory stays
+    bounded by the window rather than the document, and pages are yielded as
+    soon as every earlier chunk is done. Closing the generator early cancels
+    the chunks that have not started.
+
+    Args:
+        pdf_path: Path to the PDF file
+        max_workers: Extraction processes; 1 extracts in this process
+        pages_per_task: Pages handed to a worker at a time
+
+    Yields:
+        Page text, one string per page
+    """
+    pages_per_task = max(1, pages_per_task)
+    total_pages = count_pages(pdf_path)
+    ranges = [(start, min(start + pages_per_task, total_pages)) for start in range(0, total_pages, pages_per_task)]
+
+    if max_workers <= 1 or len(ranges) <= 1:
+        for start, stop in ranges:
+            yield from extract_page_range(pdf_path, start, stop)
+        return
+
+    window = max_workers * 2
+    # Spawn so workers never inherit model threads from the API process
+    context = mp.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=min(max_workers, len(ranges)), mp_context=context)
+    try:
+        pending = deque()
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while next_range < len(ranges) and len(pending) < window:
+                start, stop = ranges[next_range]
+                pending.append(pool.submit(extract_page_range, pdf_path, start, stop))
+                next_range += 1
+            yield from pending.popleft().result()
+    finally:
+        # Runs on close() too: a consumer that stops early drops the queued
+        # chunks and leaves the running ones to finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
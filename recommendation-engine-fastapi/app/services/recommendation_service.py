@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import Awaitable, List, Dict, Any, Optional, TypeVar
 from datetime import datetime
 import random
 
@@ -10,99 +12,253 @@ from ..models.recommendation import (
 from .model_service import model_service
 from .vector_store import vector_store
 from ..config import settings
+from ..utils.cache import LRUCache
+from ..utils.metrics import LatencyStats
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+PIPELINE_STAGES = ('intent', 'search', 'rank', 'fallback', 'total')
+
 class RecommendationService:
     _instance = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(RecommendationService, cls).__new__(cls)
+            cls._instance.intent_cache = LRUCache(
+                max_size=settings.INTENT_CACHE_SIZE,
+                ttl=settings.INTENT_CACHE_TTL_SECONDS
+            )
+            cls._instance.response_cache = LRUCache(
+                max_size=settings.RESPONSE_CACHE_SIZE,
+                ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+                sizeof=lambda response: len(response.model_dump_json())
+            )
+            cls._instance.response_cache_version = None
+            cls._instance.negative_hits = 0
+            cls._instance.inflight: Dict[tuple, asyncio.Task] = {}
+            cls._instance.inflight_waiters = 0
+            cls._instance.coalesced_requests = 0
+            cls._instance.stage_times = {stage: LatencyStats() for stage in PIPELINE_STAGES}
         return cls._instance
     
+    @staticmethod
+    def _canonical_query(user_query: str, ui_chips: List[str]) -> tuple:
+        """Canonical form of a query: lowercased, whitespace-collapsed, chips sorted."""
+        def normalize(text: str) -> str:
+            return " ".join(text.lower().split())
+        
+        chips = sorted({normalize(chip) for chip in ui_chips if chip and chip.strip()})
+        return (normalize(user_query), tuple(chips))
+    
+    def _response_key(self, request: RecommendationRequest) -> tuple:
+        """Cache key of a request: its canonical query plus the result shaping knobs."""
+        return (
+            self._canonical_query(request.user_query, request.ui_chips),
+            request.max_results,
+            request.min_confidence
+        )
+    
+    def _sync_response_cache(self) -> None:
+        """Drop cached responses once ingestion has changed the catalog."""
+        version = vector_store.catalog_version
+        if version != self.response_cache_version:
+            if self.response_cache_version is not None and len(self.response_cache):
+                logger.info(
+                    f"Catalog version {self.response_cache_version} -> {version}, "
+                    f"dropping {len(self.response_cache)} cached responses"
+                )
+            self.response_cache.clear()
+            self.response_cache_version = version
+    
     async def get_recommendations(self, request: RecommendationRequest) -> RecommendationResponse:
         """Get course recommendations based on user query.
         
+        Finished responses are cached per canonical request until they expire
+        or the catalog version changes. Degraded responses (no recommendations,
+        or fallback picks because search found nothing usable) are cached only
+        for ``RESPONSE_CACHE_NEGATIVE_TTL_SECONDS``, so a transient search or
+        embedding failure is not served for the full TTL. Identical
+        requests arriving while one is being computed wait for that
+        computation instead of starting their own, cache or no cache.
+        
         Args:
             request: The recommendation request object
             
         Returns:
             RecommendationResponse containing the recommendations
         """
+        self._sync_response_cache()
+        key = self._response_key(request)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            if self._is_degraded(cached):
+                self.negative_hits += 1
+            logger.info(f"Using cached recommendations for: {request.user_query}")
+            # Echo this caller's own query text; the nested items are shared
+            # between requests and treated as read-only
+            return cached.model_copy(update={
+                'query': request.user_query,
+                'timestamp': datetime.utcnow().isoformat()
+            })
+        
+        version = self.response_cache_version
+        flight_key = (version, key)
+        task = self.inflight.get(flight_key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_cache(key, request, version))
+            self.inflight[flight_key] = task
+            task.add_done_callback(lambda done: self._finish_flight(flight_key, done))
+            # Shielded so a disconnecting first caller does not cancel the others
+            response = await asyncio.shield(task)
+        else:
+            self.coalesced_requests += 1
+            self.inflight_waiters += 1
+            logger.info(f"Joining in-flight recommendations for: {request.user_query}")
+            try:
+                response = await asyncio.shield(task)
+            finally:
+                self.inflight_waiters -= 1
+        return response.model_copy(update={'query': request.user_query})
+    
+    async def _compute_and_cache(
+        self,
+        key: tuple,
+        request: RecommendationRequest,
+        version: Optional[int]
+    ) -> RecommendationResponse:
+        """Compute a response and cache it if the catalog did not change meanwhile."""
+        response = await self._compute_recommendations(request)
+        
+        if vector_store.catalog_version == version:
+            if not self._is_degraded(response):
+                self.response_cache.set(key, response)
+            elif settings.RESPONSE_CACHE_NEGATIVE_TTL_SECONDS > 0:
+                self.response_cache.set(key, response, ttl=settings.RESPONSE_CACHE_NEGATIVE_TTL_SECONDS)
+        return response
+    
+    @staticmethod
+    def _is_degraded(response: RecommendationResponse) -> bool:
+        """Whether a response is empty or made of fallback picks rather than matches."""
+        return not response.recommendations or response.match_type == "fallback"
+    
+    def _finish_flight(self, flight_key: tuple, task: asyncio.Task) -> None:
+        if self.inflight.get(flight_key) is task:
+            del self.inflight[flight_key]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+    
+    async def _compute_recommendations(self, request: RecommendationRequest) -> RecommendationResponse:
+        """Run the full intent, search and ranking pipeline for one request.
+        
+        Intent parsing and vector search both work from the enhanced query
+        and do not depend on each other, so they run concurrently and are
+        joined for ranking. Each stage's duration is recorded in
+        ``stage_times``.
+        """
+        started_at = time.perf_counter()
         logger.info(f"Processing recommendation request: {request.user_query}")
         
         # Combine query with UI chips for enhanced search
         enhanced_query = " ".join([request.user_query] + request.ui_chips)
         logger.info(f"Enhanced query: {enhanced_query}")
         
-        # Parse user intent using the model service
+        try:
+            intent, similar_results = await asyncio.gather(
+                self._timed('intent', self._resolve_intent(request, enhanced_query)),
+                # Get more results than needed; low scores are filtered while ranking
+                self._timed('search', vector_store.search_similar_courses(
+                    query=enhanced_query,
+                    k=request.max_results * 2,
+                    min_score=0.0
+                ))
+            )
+            
+            if similar_results:
+                logger.info(f"Found {len(similar_results)} vector search results")
+                
+                # Convert to RecommendationItems and determine match types
+                recommendations = await self._timed('rank', self._process_vector_results(
+                    similar_results, 
+                    intent, 
+                    request.max_results,
+                    request.min_confidence
+                ))
+                
+                if recommendations:
+                    # Determine overall match type
+                    match_type = self._determine_overall_match_type(recommendations)
+                    
+                    return self._format_response(
+                        query=request.user_query,
+                        intent=intent,
+                        recommendations=recommendations,
+                        match_type=match_type
+                    )
+            
+            # Final fallback - create generic recommendations
+            logger.info("Using fallback recommendations")
+            fallback_recommendations = await self._timed(
+                'fallback',
+                self._generate_fallback_recommendations(intent, request.max_results)
+            )
+            
+            return self._format_response(
+                query=request.user_query,
+                intent=intent,
+                recommendations=fallback_recommendations,
+                match_type="fallback"
+            )
+        finally:
+            self.stage_times['total'].record(time.perf_counter() - started_at)
+    
+    async def _resolve_intent(self, request: RecommendationRequest, enhanced_query: str) -> UserIntent:
+        """Parse the user intent, reusing recent parses of the same canonical query."""
+        intent_key = self._canonical_query(request.user_query, request.ui_chips)
+        intent = self.intent_cache.get(intent_key)
+        if intent is not None:
+            intent = intent.model_copy(deep=True)
+            logger.info(f"Using cached intent: {intent}")
+            return intent
+        
         try:
             intent_dict = await model_service.parse_intent(enhanced_query)
+            parsed_with = intent_dict.pop('parsed_with', None)
             intent = UserIntent(**intent_dict)
-            logger.info(f"Parsed intent: {intent}")
+            # Keyword-only parses (spaCy still loading or failing) are not
+            # cached, so the full parse replaces them as soon as it works
+            if parsed_with == 'nlp':
+                self.intent_cache.set(intent_key, intent)
+            logger.info(f"Parsed intent ({parsed_with}): {intent}")
         except Exception as e:
             logger.warning(f"Intent parsing failed, using fallback: {e}")
             intent = self._create_fallback_intent(enhanced_query)
-        
-        # Search for courses using vector similarity
-        similar_results = await vector_store.search_similar_courses(
-            query=enhanced_query,
-            k=request.max_results * 2,  # Get more results to filter later
-            min_score=0.0  # Allow all results for now, we'll filter later
-        )
-        
-        if similar_results:
-            logger.info(f"Found {len(similar_results)} vector search results")
-            
-            # Convert to RecommendationItems and determine match types
-            recommendations = await self._process_vector_results(
-                similar_results, 
-                intent, 
-                request.max_results,
-                request.min_confidence
-            )
-            
-            if recommendations:
-                # Determine overall match type
-                match_type = self._determine_overall_match_type(recommendations)
-                
-                return self._format_response(
-                    query=request.user_query,
-                    intent=intent,
-                    recommendations=recommendations,
-                    match_type=match_type
-                )
-        
-        # Final fallback - create generic recommendations
-        logger.info("Using fallback recommendations")
-        fallback_recommendations = await self._generate_fallback_recommendations(intent, request.max_results)
-        
-        return self._format_response(
-            query=request.user_query,
-            intent=intent,
-            recommendations=fallback_recommendations,
-            match_type="fallback"
-        )
+        return intent
+    
+    async def _timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """Await one pipeline stage and record how long it took."""
+        started_at = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stage_times[stage].record(time.perf_counter() - started_at)
     
     def _create_fallback_intent(self, query: str) -> UserIntent:
         """Create a fallback intent when parsing fails."""
-        query_lower = query.lower()
+        scan = model_service.scan_keywords(query)
         
         # Extract basic information
         level = "beginner"
-        if any(word in query_lower for word in ["advanced", "expert", "master"]):
+        if scan.has('level', 'advanced'):
             level = "advanced"
-        elif any(word in query_lower for word in ["intermediate", "medium"]):
+        elif scan.has('level', 'intermediate'):
             level = "intermediate"
         
         # Extract basic keywords
-        tech_keywords = [
-            "python", "javascript", "java", "nodejs", "react", "angular", "vue",
-            "backend", "frontend", "fullstack", "api", "database", "web", "mobile"
-        ]
-        
-        keywords = [kw for kw in tech_keywords if kw in query_lower]
+        keywords = scan.values('keyword')
         
         return UserIntent(
             level=level,
@@ -185,9 +341,12 @@ class RecommendationService:
             if keyword.lower() in course_title_lower:
                 exact_score_boost += 0.15
         
-        # Topic matches in tags
-        for topic in intent.topics:
-            if any(topic.lower() == tag.lower() for tag in course.tags):
+        # Topic and category matches in tags or the course's own category;
+        # skill categories are display names like the catalog's categories
+        tags = {tag.lower() for tag in course.tags}
+        course_category = course.category.lower()
+        for topic in dict.fromkeys(topic.lower() for topic in intent.topics + intent.categories):
+            if topic in tags or topic == course_category:
                 exact_score_boost += 0.1
         
         # Apply boost
@@ -338,6 +497,23 @@ class RecommendationService:
         
         return recommendations
     
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache statistics for the recommendation pipeline."""
+        return {
+            'intent_cache': self.intent_cache.get_stats(),
+            'response_cache': {
+                **self.response_cache.get_stats(),
+                'negative_hits': self.negative_hits,
+                'catalog_version': self.response_cache_version
+            },
+            'stage_times': {stage: stats.snapshot() for stage, stats in self.stage_times.items()},
+            'single_flight': {
+                'inflight': len(self.inflight),
+                'waiting': self.inflight_waiters,
+                'coalesced_requests': self.coalesced_requests
+            }
+        }
+    
     def _format_response(
         self,
         query: str,
@@ -356,6 +532,3 @@ class RecommendationService:
 
 # Singleton instance
 recommendation_service = RecommendationService()
-
-# Singleton instance
-recommendation_service = RecommendationService()
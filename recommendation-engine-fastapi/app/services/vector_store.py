@@ -1,12 +1,21 @@
-import chromadb
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import asyncio
 import logging
 import os
 import json
+import numpy as np
+from datetime import datetime
+from .numpy_vector_index import NumpyVectorIndex
+from .course_snapshot import load_snapshot, snapshot_paths, SnapshotError
+from .model_service import model_service
 from ..config import settings
+from ..utils.executor import BoundedExecutor
 
 logger = logging.getLogger(__name__)
 
+# Source recorded for the placeholder courses; any real ingestion replaces them
+SAMPLE_SOURCE = "sample"
+
 class VectorStoreService:
     _instance = None
     
@@ -20,72 +29,194 @@ class VectorStoreService:
             self.client = None
             self.collection = None
             self.is_initialized = False
+            self.executor = BoundedExecutor(
+                name="chroma-io",
+                max_workers=settings.CHROMA_POOL_SIZE,
+                default_timeout=settings.CHROMA_CALL_TIMEOUT
+            )
+            # Catalog state served to the request path without a round trip
+            self.catalog_count = 0
+            self.catalog_version = 0
+            self.last_ingest_at: Optional[datetime] = None
+            self.state_refreshed_at: Optional[datetime] = None
+            self._refresher: Optional[asyncio.Task] = None
             self._initialized = True
     
+    @property
+    def backend(self) -> str:
+        """Name of the configured vector store backend."""
+        return settings.VECTOR_BACKEND.lower()
+    
+    async def _call(self, fn, *args, **kwargs):
+        """Run a collection call without blocking the event loop.
+        
+        ChromaDB's HttpClient is synchronous, so its calls go through the
+        dedicated I/O pool. The in-process index is cheap enough to call inline.
+        """
+        if self.backend == "numpy":
+            return fn(*args, **kwargs)
+        return await self.executor.run(fn, *args, **kwargs)
+    
     async def initialize(self):
-        """Initialize the ChromaDB client and collection."""
+        """Initialize the vector store backend and collection."""
         try:
-            self.client = chromadb.HttpClient(
-                host=settings.CHROMA_HOST,
-                port=settings.CHROMA_PORT
-            )
-            logger.info(f"Connected to ChromaDB at {settings.CHROMA_HOST}:{settings.CHROMA_PORT}")
-            
-            # Get or create the collection
-            self.collection = self.client.get_or_create_collection(
-                name=settings.CHROMA_COLLECTION,
-                metadata={"hnsw:space": "cosine"}
-            )
+            if self.backend == "numpy":
+                self.client = None
+                self.collection = NumpyVectorIndex(name=settings.CHROMA_COLLECTION)
+                logger.info("Using in-process NumPy vector index")
+            else:
+                # Imported here so that importing the app stays cheap
+                import chromadb
+                self.client = await self.executor.run(
+                    chromadb.HttpClient,
+                    host=settings.CHROMA_HOST,
+                    port=settings.CHROMA_PORT
+                )
+                logger.info(f"Connected to ChromaDB at {settings.CHROMA_HOST}:{settings.CHROMA_PORT}")
+                
+                # Get or create the collection
+                self.collection = await self.executor.run(
+                    self.client.get_or_create_collection,
+                    name=settings.CHROMA_COLLECTION,
+                    metadata={"hnsw:space": "cosine"},
+                    # Queries and documents are embedded by ModelService; never
+                    # fall back to Chroma's bundled default model
+                    embedding_function=None
+                )
             logger.info(f"Using collection: {settings.CHROMA_COLLECTION}")
             
+            # The collection is usable from here on, including by the initial load
+            self.is_initialized = True
+            
             # Check if we need to ingest data
-            count = self.collection.count()
-            logger.info(f"Collection has {count} documents")
+            await self.refresh_catalog_state()
+            logger.info(f"Collection has {self.catalog_count} documents")
             
-            if count == 0:
+            if self.catalog_count == 0:
                 await self._load_course_data()
             
-            self.is_initialized = True
+            self.start_refresher()
             
         except Exception as e:
-            logger.error(f"Failed to initialize ChromaDB: {e}")
+            logger.error(f"Failed to initialize vector store ({self.backend}): {e}")
             self.is_initialized = False
     
     async def get_collection_count(self) -> int:
-        """Get the number of documents in the collection."""
+        """Get the number of documents in the collection, asking the backend."""
         try:
             if not self.is_initialized or not self.collection:
                 return 0
-            return self.collection.count()
+            return await self._call(self.collection.count)
         except Exception as e:
             logger.error(f"Failed to get collection count: {e}")
             return 0
     
+    async def refresh_catalog_state(self, written: bool = False) -> None:
+        """Reconcile the cached catalog state with the backend.
+        
+        The catalog version increases whenever this process writes to the
+        collection, and also when the count has drifted because someone else
+        did; caches keyed on it are invalidated either way. Upserts made by
+        another process that leave the count unchanged are not detected.
+        
+        If the backend cannot be reached, the previous count is kept rather
+        than read as an empty catalog.
+        
+        Args:
+            written: This process has just written to the collection
+        """
+        if written:
+            self.catalog_version += 1
+            self.last_ingest_at = datetime.utcnow()
+        if not self.is_initialized or not self.collection:
+            return
+        
+        try:
+            count = await self._call(self.collection.count)
+        except Exception as e:
+            logger.warning(f"Failed to refresh catalog count, keeping {self.catalog_count}: {e}")
+            return
+        
+        if count != self.catalog_count and not written:
+            self.catalog_version += 1
+        self.catalog_count = count
+        self.state_refreshed_at = datetime.utcnow()
+    
+    def get_catalog_state(self) -> Dict[str, Any]:
+        """Return the cached catalog state; never touches the backend."""
+        return {
+            'document_count': self.catalog_count,
+            'catalog_version': self.catalog_version,
+            'last_ingest_at': self.last_ingest_at.isoformat() if self.last_ingest_at else None,
+            'refreshed_at': self.state_refreshed_at.isoformat() if self.state_refreshed_at else None
+        }
+    
+    def start_refresher(self) -> None:
+        """Start reconciling the catalog state every ``CATALOG_REFRESH_INTERVAL`` seconds."""
+        if settings.CATALOG_REFRESH_INTERVAL <= 0 or (self._refresher and not self._refresher.done()):
+            return
+        self._refresher = asyncio.create_task(self._refresh_periodically())
+    
+    async def stop_refresher(self) -> None:
+        """Stop the background catalog state refresher."""
+        if self._refresher:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+    
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.CATALOG_REFRESH_INTERVAL)
+            try:
+                await self.refresh_catalog_state()
+            except Exception as e:
+                logger.warning(f"Failed to refresh catalog state: {e}")
+    
     async def _load_course_data(self):
         """Load course data into the vector store if not already loaded."""
         try:
-            # Check for processed course data
-            data_path = os.path.join(os.path.dirname(__file__), '../../data/processed_courses.json')
+            loaded = await asyncio.to_thread(self._read_processed_courses)
             
-            if os.path.exists(data_path):
-                logger.info("Loading processed course data...")
-                with open(data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                courses = data.get('courses', [])
-                if courses:
-                    await self.add_courses(courses)
-                    logger.info(f"Loaded {len(courses)} courses into vector store")
-                else:
-                    logger.warning("No courses found in processed data")
-            else:
-                logger.warning(f"Processed course data not found at {data_path}")
+            if loaded is None:
+                logger.warning(f"Processed course data not found at {snapshot_paths()[1]}")
                 await self._create_sample_data()
+                return
+            
+            courses, embeddings = loaded
+            if courses:
+                await self.add_courses(courses, embeddings)
+                logger.info(f"Loaded {len(courses)} courses into vector store")
+            else:
+                logger.warning("No courses found in processed data")
                 
         except Exception as e:
             logger.error(f"Failed to load course data: {e}")
             await self._create_sample_data()
     
+    def _read_processed_courses(self) -> Optional[Tuple[List[Dict[str, Any]], Optional[np.ndarray]]]:
+        """Read processed courses from the binary snapshot, or the legacy JSON file.
+        
+        Returns:
+            (courses, embeddings matrix) from the snapshot, (courses with
+            inline embeddings, None) from the legacy file, or None if neither
+            exists
+        """
+        try:
+            courses, embeddings = load_snapshot(verify=settings.SNAPSHOT_VERIFY_ON_LOAD)
+            logger.info("Loading processed course snapshot...")
+            return courses, embeddings
+        except SnapshotError as e:
+            logger.info(f"No usable course snapshot ({e}), trying legacy JSON")
+        
+        data_path = os.path.join(os.path.dirname(__file__), '../../data/processed_courses.json')
+        if not os.path.exists(data_path):
+            return None
+        
+        logger.info("Loading processed course data...")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('courses', []), None
+    
     async def _create_sample_data(self):
         """Create sample course data if no processed data is available."""
         logger.info("Creating sample course data...")
@@ -168,14 +299,29 @@ class VectorStoreService:
             }
         ]
         
+        for course in sample_courses:
+            course['source'] = SAMPLE_SOURCE
+        
         await self.add_courses(sample_courses)
         logger.info(f"Created {len(sample_courses)} sample courses")
     
-    async def add_courses(self, courses: List[Dict[str, Any]]) -> bool:
-        """Add course documents to the vector store.
+    async def add_courses(
+        self,
+        courses: List[Dict[str, Any]],
+        embeddings: Optional[np.ndarray] = None
+    ) -> bool:
+        """Insert or update course documents in the vector store.
+        
+        Existing ids are overwritten, so re-ingesting a course updates it
+        instead of failing or duplicating it. Courses without an embedding are
+        embedded with the service model in one batch; if the model isn't
+        loaded they are skipped rather than stored with a placeholder vector.
         
         Args:
-            courses: List of course dictionaries with embeddings
+            courses: List of course dictionaries, normally with embeddings
+            embeddings: Optional matrix with one row per course, used instead
+                of the courses' own ``embedding`` lists; the in-process index
+                takes it as is, without building Python lists
             
         Returns:
             bool: True if successful, False otherwise
@@ -185,22 +331,25 @@ class VectorStoreService:
             return False
             
         try:
-            # Prepare data for ChromaDB
+            if embeddings is None:
+                courses = await self._ensure_embeddings(courses)
+                if not courses:
+                    return True
+                embeddings = [course['embedding'] for course in courses]
+            elif len(embeddings) != len(courses):
+                raise ValueError(f"{len(embeddings)} embeddings for {len(courses)} courses")
+            elif self.backend != "numpy":
+                # ChromaDB's HTTP API serializes embeddings as JSON lists anyway
+                embeddings = np.asarray(embeddings, dtype=np.float32).tolist()
+            
+            # Prepare data for the collection
             ids = []
-            embeddings = []
             metadatas = []
             documents = []
             
             for course in courses:
                 ids.append(course['id'])
                 
-                # Use embedding if available, otherwise create a dummy one
-                if 'embedding' in course and course['embedding']:
-                    embeddings.append(course['embedding'])
-                else:
-                    # Create a simple dummy embedding for demonstration
-                    embeddings.append([0.0] * 384)
-                
                 # Prepare metadata
                 metadata = {
                     'title': course.get('title', ''),
@@ -211,7 +360,9 @@ class VectorStoreService:
                     'students_count': course.get('students_count', 0),
                     'instructor': course.get('instructor', ''),
                     'tags': ','.join(course.get('tags', [])),
-                    'features': ','.join(course.get('features', []))
+                    'features': ','.join(course.get('features', [])),
+                    'content_hash': course.get('content_hash', ''),
+                    'source': course.get('source', '')
                 }
                 metadatas.append(metadata)
                 
@@ -219,21 +370,106 @@ class VectorStoreService:
                 document_text = course.get('embedding_text', course.get('description', ''))
                 documents.append(document_text)
             
-            # Add to ChromaDB
-            self.collection.add(
+            # Upsert into the collection
+            await self._call(
+                self.collection.upsert,
                 ids=ids,
                 embeddings=embeddings,
                 metadatas=metadatas,
                 documents=documents
             )
             
-            logger.info(f"Added {len(courses)} courses to vector store")
+            logger.info(f"Upserted {len(courses)} courses into vector store")
+            await self.refresh_catalog_state(written=True)
             return True
             
         except Exception as e:
             logger.error(f"Failed to add courses to vector store: {e}")
             return False
     
+    async def _ensure_embeddings(self, courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the courses that have (or could be given) an embedding."""
+        missing = [course for course in courses if not course.get('embedding')]
+        if not missing:
+            return courses
+        
+        if not model_service.is_initialized:
+            logger.warning(f"Skipping {len(missing)} courses without embeddings: model service not ready")
+            return [course for course in courses if course.get('embedding')]
+        
+        texts = [course.get('embedding_text', course.get('description', '')) for course in missing]
+        vectors = await model_service.generate_embeddings(texts, use_cache=False)
+        embedded = {id(course): vector for course, vector in zip(missing, vectors)}
+        
+        return [
+            course if course.get('embedding') else {**course, 'embedding': embedded[id(course)]}
+            for course in courses
+        ]
+    
+    async def get_content_hashes(self, sources: Optional[List[str]] = None) -> Dict[str, str]:
+        """Return the stored content hash of each course, keyed by id.
+        
+        Args:
+            sources: Only include courses ingested from these sources; all
+                courses when omitted
+        """
+        if not self.is_initialized or not self.collection:
+            return {}
+        
+        results = await self._call(self.collection.get, include=["metadatas"])
+        return {
+            doc_id: (metadata or {}).get('content_hash', '')
+            for doc_id, metadata in zip(results['ids'], results['metadatas'] or [])
+            if sources is None or (metadata or {}).get('source', '') in sources
+        }
+    
+    async def iter_embeddings(
+        self,
+        ids: List[str],
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[List[str], np.ndarray]]:
+        """Yield the stored embeddings for ``ids`` one page at a time.
+        
+        Each page is its own ``get`` call, so no single call has to return
+        the whole catalog within ``CHROMA_CALL_TIMEOUT`` and only one page of
+        embeddings is in memory at a time. Ids missing from the store are
+        left out.
+        
+        Args:
+            ids: Document ids to fetch
+            page_size: Ids per call; defaults to ``settings.SNAPSHOT_PAGE_SIZE``
+            
+        Yields:
+            (ids found, float32 matrix with one row per id)
+        """
+        if not self.is_initialized or not self.collection:
+            return
+        
+        page_size = max(1, page_size or settings.SNAPSHOT_PAGE_SIZE)
+        for start in range(0, len(ids), page_size):
+            results = await self._call(
+                self.collection.get, ids=ids[start:start + page_size], include=["embeddings"]
+            )
+            if results['ids']:
+                yield list(results['ids']), np.asarray(results['embeddings'], dtype=np.float32)
+    
+    async def delete_courses(self, ids: List[str]) -> bool:
+        """Remove courses from the vector store by id."""
+        if not ids:
+            return True
+        if not self.is_initialized or not self.collection:
+            logger.error("Vector store not initialized")
+            return False
+        
+        try:
+            await self._call(self.collection.delete, ids=ids)
+            logger.info(f"Deleted {len(ids)} courses from vector store")
+            await self.refresh_catalog_state(written=True)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete courses from vector store: {e}")
+            return False
+    
     async def search_similar_courses(
         self, 
         query: str, 
@@ -252,55 +488,113 @@ class VectorStoreService:
         Returns:
             List of matching courses with scores
         """
+        results = await self.search_many([query], k, filter_conditions, min_score)
+        return results[0] if results else []
+    
+    async def search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for similar courses for several queries in one round trip.
+        
+        All queries are embedded in a single model call and sent to the
+        collection as one ``query`` with every embedding, so bulk callers pay
+        one encode and one store round trip instead of one per query.
+        
+        Args:
+            queries: The search queries
+            k: Number of results to return per query
+            filters: Optional filters applied to every query
+            min_score: Minimum similarity score (0-1)
+            
+        Returns:
+            One list of matching courses with scores per query, in order
+        """
+        if not queries:
+            return []
         if not self.is_initialized or not self.collection:
             logger.error("Vector store not initialized")
-            return []
+            return [[] for _ in queries]
             
         try:
-            # Search in ChromaDB using text query
-            results = self.collection.query(
-                query_texts=[query],
+            # Embed the queries with the same model that embedded the courses,
+            # rather than letting ChromaDB run its own default embedding function.
+            # A lone query goes through the micro-batcher so concurrent requests
+            # still share an encode call.
+            if len(queries) == 1:
+                query_embeddings = [await model_service.generate_embedding(queries[0])]
+            else:
+                query_embeddings = await model_service.generate_embeddings(queries)
+            results = await self._call(
+                self.collection.query,
+                query_embeddings=query_embeddings,
                 n_results=k,
-                where=filter_conditions
+                where=filters
             )
             
-            # Process results
-            matches = []
-            if results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    # Convert distance to similarity score
-                    distance = results['distances'][0][i] if results['distances'] and results['distances'][0] else 0
-                    score = max(0, 1.0 - distance)  # Convert distance to similarity
-                    
-                    if score >= min_score:
-                        metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
-                        
-                        course_data = {
-                            'id': doc_id,
-                            'score': score,
-                            'title': metadata.get('title', ''),
-                            'level': metadata.get('level', ''),
-                            'category': metadata.get('category', ''),
-                            'price': metadata.get('price', 0),
-                            'rating': metadata.get('rating', 0),
-                            'students_count': metadata.get('students_count', 0),
-                            'instructor': metadata.get('instructor', ''),
-                            'tags': metadata.get('tags', '').split(',') if metadata.get('tags') else [],
-                            'features': metadata.get('features', '').split(',') if metadata.get('features') else [],
-                            'document': results['documents'][0][i] if results['documents'] and results['documents'][0] else '',
-                            'metadata': metadata
-                        }
-                        matches.append(course_data)
-            
-            # Sort by score in descending order
-            matches.sort(key=lambda x: x['score'], reverse=True)
-            
-            logger.info(f"Found {len(matches)} matches for query: {query}")
-            return matches
+            all_matches = []
+            for i, query in enumerate(queries):
+                matches = self._build_matches(results, i, min_score)
+                logger.info(f"Found {len(matches)} matches for query: {query}")
+                all_matches.append(matches)
+            return all_matches
             
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
-            return []
+            return [[] for _ in queries]
+    
+    @staticmethod
+    def _build_matches(results: Dict[str, Any], index: int, min_score: float) -> List[Dict[str, Any]]:
+        """Turn the ``index``-th query of a collection result into course matches."""
+        def column(key: str) -> List[Any]:
+            values = results.get(key)
+            return values[index] if values and len(values) > index and values[index] else []
+        
+        ids = column('ids')
+        distances = column('distances')
+        metadatas = column('metadatas')
+        documents = column('documents')
+        
+        matches = []
+        for i, doc_id in enumerate(ids):
+            # Convert distance to similarity score
+            distance = distances[i] if distances else 0
+            score = max(0, 1.0 - distance)
+            
+            if score >= min_score:
+                metadata = (metadatas[i] if metadatas else None) or {}
+                
+                course_data = {
+                    'id': doc_id,
+                    'score': score,
+                    'title': metadata.get('title', ''),
+                    'level': metadata.get('level', ''),
+                    'category': metadata.get('category', ''),
+                    'price': metadata.get('price', 0),
+                    'rating': metadata.get('rating', 0),
+                    'students_count': metadata.get('students_count', 0),
+                    'instructor': metadata.get('instructor', ''),
+                    'tags': metadata.get('tags', '').split(',') if metadata.get('tags') else [],
+                    'features': metadata.get('features', '').split(',') if metadata.get('features') else [],
+                    'document': documents[i] if documents else '',
+                    'metadata': metadata
+                }
+                matches.append(course_data)
+        
+        # Sort by score in descending order
+        matches.sort(key=lambda x: x['score'], reverse=True)
+        return matches
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return catalog state and I/O pool statistics for the vector store."""
+        return {
+            'backend': self.backend,
+            'catalog': self.get_catalog_state(),
+            'io_pool': self.executor.get_stats()
+        }
 
 # Backward compatibility
 async def search_similar(query: str, k: int = 5, min_score: float = 0.6, filter_conditions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into batched calls.
+
+    Callers ``await submit(item)``. A worker collects queued items until it has
+    ``max_batch_size`` of them or ``max_wait_ms`` has passed since the first one
+    arrived, runs ``process_batch`` once on a dedicated thread, and hands each
+    caller the result at its position. ``process_batch`` must return one result
+    per input item, in order. Items must be hashable: a caller submitting an
+    item that is already queued or being processed shares that item's result
+    instead of adding it again. If a batch raises, its items are retried one
+    at a time, so only the callers of the items that still fail get the error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self.batches = 0
+        self.items = 0
+        self.deduplicated = 0
+        self.retried = 0
+        self.batch_time = LatencyStats()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` for the next batch and wait for its result."""
+        self._ensure_worker()
+        future = self._pending.get(item)
+        if future is None:
+            future = self._loop.create_future()
+            self._pending[item] = future
+            future.add_done_callback(lambda done: self._forget(item, done))
+            await self._queue.put((item, future))
+        else:
+            self.deduplicated += 1
+        # Shielded so one cancelled caller does not fail the others sharing the item
+        return await asyncio.shield(future)
+
+    def _forget(self, item: Any, future: asyncio.Future) -> None:
+        if self._pending.get(item) is future:
+            del self._pending[item]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not future.cancelled():
+            future.exception()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._pending = {}
+            self._worker = loop.create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _process(self, items: List[Any]) -> List[Any]:
+        """Run ``process_batch`` on the worker thread and check its result count."""
+        results = await self._loop.run_in_executor(self._executor, self.process_batch, items)
+        if len(results) != len(items):
+            raise RuntimeError(f"expected {len(items)} results, got {len(results)}")
+        return results
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            started_at = time.perf_counter()
+            try:
+                results = await self._process(items)
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                if len(batch) == 1:
+                    logger.error(f"{self.name}: item failed: {e}")
+                    self._fail(batch[0][1], e)
+                else:
+                    # One bad item must not fail the unrelated callers it was
+                    # batched with, so each item is retried on its own
+                    logger.warning(f"{self.name}: batch of {len(items)} failed ({e}), retrying items individually")
+                    await self._retry_individually(batch)
+            finally:
+                self.batches += 1
+                self.items += len(items)
+                self.batch_time.record(time.perf_counter() - started_at)
+
+    async def _retry_individually(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        for item, future in batch:
+            if future.done():
+                continue
+            self.retried += 1
+            try:
+                result = (await self._process([item]))[0]
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"{self.name}: item failed: {e}")
+                self._fail(future, e)
+
+    @staticmethod
+    def _fail(future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return batch counts, average batch size and batch latency."""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'items': self.items,
+            'deduplicated': self.deduplicated,
+            'retried': self.retried,
+            'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'batch_time': self.batch_time.snapshot()
+        }
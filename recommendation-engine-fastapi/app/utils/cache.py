@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class LRUCache:
+    """A bounded, thread-safe least-recently-used cache with hit/miss counters.
+
+    Entries optionally expire ``ttl`` seconds after they were stored; an
+    expired entry counts as a miss and is dropped on lookup. When ``sizeof``
+    is given, each value is measured once on insert and the running total is
+    reported as ``memory_bytes``.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it most recently used."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.memory_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full.
+
+        ``ttl`` overrides the cache-wide lifetime for this entry only.
+        """
+        if self.max_size <= 0:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous[2]
+            self._data[key] = (value, expires_at, size)
+            self.memory_bytes += size
+            while len(self._data) > self.max_size:
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        with self._lock:
+            self._data.clear()
+            self.memory_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return size, hit/miss/eviction counters and measured memory."""
+        lookups = self.hits + self.misses
+        stats = {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+        if self.sizeof:
+            stats['memory_bytes'] = self.memory_bytes
+        return stats
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, TypeVar
+
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class BoundedExecutor:
+    """A dedicated, fixed-size thread pool for blocking I/O called from async code.
+
+    Keeping blocking client calls on their own pool means a slow dependency can
+    only tie up these workers, never the event loop or the loop's default
+    executor. Each call gets a timeout, and the time a call spends queued
+    before a worker picks it up is recorded separately from its run time.
+    """
+
+    def __init__(self, name: str, max_workers: int, default_timeout: Optional[float] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.queue_wait = LatencyStats()
+        self.run_time = LatencyStats()
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs) -> T:
+        """Run ``fn`` on the pool and await its result.
+
+        Args:
+            fn: The blocking callable
+            timeout: Seconds to wait before giving up; defaults to ``default_timeout``
+
+        Returns:
+            Whatever ``fn`` returns
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time. The worker
+                thread still runs the call to completion in the background.
+        """
+        submitted_at = time.perf_counter()
+
+        def _call():
+            started_at = time.perf_counter()
+            self.queue_wait.record(started_at - submitted_at)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.run_time.record(time.perf_counter() - started_at)
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, _call)
+            result = await asyncio.wait_for(future, self.default_timeout if timeout is None else timeout)
+            with self._lock:
+                self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"{self.name}: {getattr(fn, '__name__', fn)} timed out")
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool utilisation and latency statistics."""
+        return {
+            'max_workers': self.max_workers,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'queue_wait': self.queue_wait.snapshot(),
+            'run_time': self.run_time.snapshot()
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._pool.shutdown(wait=False)
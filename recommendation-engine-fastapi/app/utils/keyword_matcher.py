@@ -0,0 +1,95 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+@dataclass
+class KeywordScan:
+    """Result of one pass of a KeywordMatcher over a text."""
+    terms: List[str] = field(default_factory=list)
+    labels: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def values(self, kind: str) -> List[Any]:
+        """Distinct values of one label kind, in order of first occurrence."""
+        return self.labels.get(kind, [])
+
+    def has(self, kind: str, value: Any) -> bool:
+        """Whether any matched term carries the label (kind, value)."""
+        return value in self.labels.get(kind, [])
+
+class KeywordMatcher:
+    """Find every term of a labelled vocabulary in a single regex pass.
+
+    All terms are compiled into one alternation, longest first, bounded so a
+    term only matches as a whole word (``java`` does not match inside
+    ``javascript``, ``ai`` not inside ``maintain``). Each term carries any
+    number of (kind, value) labels, e.g. ``("category", "databases")`` or
+    ``("level", "beginner")``, so one scan answers every question a caller has
+    about the text. The alternation is factored into a prefix trie, so the
+    pattern behaves like a keyword automaton whose cost grows with the length
+    of the text rather than with the number of terms.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Any]]):
+        """
+        Args:
+            entries: (term, kind, value) triples; a term may appear many times
+        """
+        self._labels: Dict[str, List[Tuple[str, Any]]] = {}
+        for term, kind, value in entries:
+            term = " ".join(term.lower().split())
+            if not term:
+                continue
+            labels = self._labels.setdefault(term, [])
+            if (kind, value) not in labels:
+                labels.append((kind, value))
+
+        alternation = self._trie_pattern(self._labels)
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)") if alternation else None
+
+    @classmethod
+    def _trie_pattern(cls, terms: Iterable[str]) -> str:
+        """Compile terms into a prefix-factored regex, longest match first.
+
+        ``python|pytorch`` becomes ``py(?:thon|torch)``, so the engine walks
+        the shared prefix once instead of retrying every term at every
+        position.
+        """
+        trie: Dict[str, Any] = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        return cls._node_pattern(trie)
+
+    @classmethod
+    def _node_pattern(cls, node: Dict[str, Any]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + cls._node_pattern(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        # Try longer continuations before ending the term here
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ("|)" if optional else ")")
+
+    def scan(self, text: str) -> KeywordScan:
+        """Return the matched terms and their labels, in order of occurrence."""
+        result = KeywordScan()
+        if not self._pattern or not text:
+            return result
+
+        # Multi-word terms match across line breaks; normalize their spacing
+        for term in dict.fromkeys(" ".join(match.split()) for match in self._pattern.findall(text.lower())):
+            result.terms.append(term)
+            for kind, value in self._labels[term]:
+                values = result.labels.setdefault(kind, [])
+                if value not in values:
+                    values.append(value)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._labels)
@@ -0,0 +1,28 @@
+import threading
+from typing import Dict, Any
+
+class LatencyStats:
+    """Thread-safe running count/total/max of durations, in seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a single observation."""
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current statistics in milliseconds."""
+        with self._lock:
+            return {
+                'count': self.count,
+                'avg_ms': (self.total / self.count) * 1000 if self.count else 0.0,
+                'max_ms': self.max * 1000
+            }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark course catalog parsing: sections parsed per second.
+
+The catalog PDF is extracted and split into course sections once; the timed
+part is DataIngestionService._extract_course_info over every section. With
+--baseline the same sections are also parsed by data_ingestion.py as of that
+git revision, giving a before/after comparison and a count of fields whose
+values changed between the two.
+
+Usage:
+    python benchmark_catalog_parsing.py [--pdf data/course-catalog.pdf] [--iterations 200] [--baseline HEAD~1]
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+# Named inside app.services so the baseline's relative imports resolve
+BASELINE_MODULE = "app.services._baseline_data_ingestion"
+
+def load_baseline(revision: str):
+    """Import data_ingestion.py from ``revision`` without touching the source tree.
+
+    The file is written to a temporary directory and loaded from there under
+    a name inside ``app.services``.
+    """
+    prefix = subprocess.run(
+        ["git", "rev-parse", "--show-prefix"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{prefix}app/services/data_ingestion.py"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data_ingestion.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+        spec = importlib.util.spec_from_file_location(BASELINE_MODULE, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[BASELINE_MODULE] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[BASELINE_MODULE]
+            raise
+    return module.DataIngestionService()
+
+def sections_per_second(service, sections: list, iterations: int) -> float:
+    """Parse every section ``iterations`` times and return the rate."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for index, section in enumerate(sections):
+            service._extract_course_info(section, index)
+    return len(sections) * iterations / (time.perf_counter() - started)
+
+def changed_fields(before: dict, after: dict) -> list:
+    """Fields whose values differ, ignoring the order of feature lists."""
+    changed = []
+    for field in after:
+        old, new = before.get(field), after[field]
+        if field == "features":
+            old, new = sorted(old or []), sorted(new)
+        if old != new:
+            changed.append(field)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", default=os.path.join(ROOT, "data", "course-catalog.pdf"))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--baseline", help="git revision to compare against, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    from app.services.data_ingestion import data_ingestion_service
+
+    text = data_ingestion_service.extract_text_from_pdf(args.pdf)
+    sections = list(data_ingestion_service._iter_course_sections([text]))
+    if not sections:
+        sys.exit(f"No course sections found in {args.pdf}")
+    print(f"{len(sections)} sections, {len(text)} characters from {args.pdf}")
+
+    implementations = [("current", data_ingestion_service)]
+    if args.baseline:
+        implementations.insert(0, (args.baseline, load_baseline(args.baseline)))
+
+    # Warm up
+    for _, service in implementations:
+        sections_per_second(service, sections, 1)
+
+    rates = {name: sections_per_second(service, sections, args.iterations) for name, service in implementations}
+
+    print(f"{'parser':<12} {'sections/s':>12}")
+    for name, rate in rates.items():
+        print(f"{name:<12} {rate:>12.1f}")
+
+    if args.baseline:
+        print(f"speedup: {rates['current'] / rates[args.baseline]:.2f}x")
+
+        baseline = implementations[0][1]
+        differences = {}
+        for index, section in enumerate(sections):
+            before = baseline._extract_course_info(section, index) or {}
+            after = data_ingestion_service._extract_course_info(section, index) or {}
+            for field in changed_fields(before, after):
+                differences[field] = differences.get(field, 0) + 1
+        if differences:
+            summary = ", ".join(f"{field}: {count}" for field, count in sorted(differences.items()))
+            print(f"sections with changed fields: {summary}")
+
+if __name__ == "__main__":
+    main()
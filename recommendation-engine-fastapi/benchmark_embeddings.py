@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark query-embedding backends: torch, ONNX fp32 and ONNX int8.
+
+Each backend runs in its own subprocess so peak RSS is measured in isolation.
+Reports single-query latency (p50/p99), batched throughput, peak RSS and
+parity (lowest cosine similarity) against the torch embeddings.
+
+Usage:
+    python benchmark_embeddings.py [--iterations 200]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ["torch", "onnx", "onnx-int8"]
+
+QUERIES = [
+    "python beginner",
+    "backend nodejs",
+    "I want to be a backend engineer and I'm interested in Node.js",
+    "How to become a Python backend developer",
+    "I'm new to programming and want to start learning",
+    "data science with pandas and machine learning",
+]
+
+def load_encoder(backend: str):
+    """Load the encoder for one backend the same way the app does."""
+    os.environ["EMBEDDING_BACKEND"] = "torch" if backend == "torch" else "onnx"
+    os.environ["EMBEDDING_ONNX_QUANTIZE"] = "true" if backend == "onnx-int8" else "false"
+
+    from app.services.model_registry import model_registry
+    return model_registry.get_embedding_model()
+
+def run_backend(backend: str, iterations: int) -> dict:
+    """Measure one backend inside the current process."""
+    started = time.perf_counter()
+    encoder = load_encoder(backend)
+    load_seconds = time.perf_counter() - started
+
+    # Warm up
+    encoder.encode(QUERIES, convert_to_numpy=True, normalize_embeddings=True)
+
+    latencies = []
+    for i in range(iterations):
+        query = QUERIES[i % len(QUERIES)]
+        started = time.perf_counter()
+        encoder.encode(query, convert_to_numpy=True, normalize_embeddings=True)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    batch = QUERIES * 8
+    started = time.perf_counter()
+    embeddings = encoder.encode(batch, batch_size=len(batch), convert_to_numpy=True, normalize_embeddings=True)
+    batch_seconds = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "batch_texts_per_sec": len(batch) / batch_seconds,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "embeddings": embeddings[:len(QUERIES)].tolist(),
+    }
+
+def parity(reference: list, candidate: list) -> float:
+    """Lowest cosine similarity between matching rows of two normalized matrices."""
+    return min(sum(a * b for a, b in zip(ref, cand)) for ref, cand in zip(reference, candidate))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--backend", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.iterations)))
+        return
+
+    results = []
+    for backend in BACKENDS:
+        print(f"Benchmarking {backend}...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, "--iterations", str(args.iterations)],
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            print(f"  {backend} failed:\n{completed.stderr}", file=sys.stderr)
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    reference = next((r["embeddings"] for r in results if r["backend"] == "torch"), None)
+
+    print(f"{'backend':<10} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {'texts/s':>9} {'RSS MB':>8} {'parity':>8}")
+    for result in results:
+        cosine = parity(reference, result["embeddings"]) if reference else float("nan")
+        print(
+            f"{result['backend']:<10} {result['load_seconds']:>7.2f} {result['p50_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['batch_texts_per_sec']:>9.1f} "
+            f"{result['peak_rss_mb']:>8.1f} {cosine:>8.4f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,9 @@ async def initialize_data():
     try:
         logger.info("Starting data initialization...")
         
-        # Check if we already have data in ChromaDB
-        if vector_store.is_initialized:
-            count = vector_store.collection.count()
-            if count > 0:
-                logger.info(f"ChromaDB already has {count} documents. Skipping initialization.")
-                return
+        # Courses are diffed against the vector store, so make sure it is up
+        if not vector_store.is_initialized:
+            await vector_store.initialize()
         
         # Path to the course catalog PDF
         pdf_path = os.path.join(os.path.dirname(__file__), '../data/course-catalog.pdf')
@@ -24,17 +21,11 @@ async def initialize_data():
         if os.path.exists(pdf_path):
             logger.info(f"Processing course catalog: {pdf_path}")
             
-            # Process the PDF and generate embeddings
+            # Process the PDF, embedding and storing only new or changed courses
             courses = await data_ingestion_service.process_catalog(pdf_path)
             
             if courses:
-                # Add courses to vector store
-                success = await vector_store.add_courses(courses)
-                
-                if success:
-                    logger.info(f"Successfully initialized {len(courses)} courses in vector store")
-                else:
-                    logger.error("Failed to add courses to vector store")
+                logger.info(f"Successfully initialized {len(courses)} courses in vector store")
             else:
                 logger.warning("No courses extracted from PDF, using sample data")
         else:
@@ -13,38 +13,28 @@ echo "� Environment: $ENVIRONMENT"
 echo "🌐 Port: $PORT"
 echo "🗄️  ChromaDB: $CHROMA_HOST:$CHROMA_PORT"
 
-# Pre-warm services by actually importing and initializing them
-echo "🔥 Pre-warming services..."
+# Make sure the model weights are on disk. The server loads the models
+# itself in its background warm-up, so nothing is loaded here.
+echo "📦 Caching model files..."
 
-python -c "
+if python -c "
 import sys
-import os
 sys.path.insert(0, '/app')
 
-print('🤖 Initializing model service...')
-from app.services.model_service import ModelService
-model_service = ModelService()
-print('✅ Model service ready')
-
-print('🗃️  Initializing vector store...')
-from app.services.vector_store import VectorStore
-vector_store = VectorStore()
-count = vector_store.get_document_count()
-print(f'✅ Vector store ready - {count} documents')
-
-print('📥 Initializing data ingestion service...')
-from app.services.data_ingestion import DataIngestionService
-data_service = DataIngestionService()
-print('✅ Data ingestion service ready')
-
-print('🎉 All services pre-warmed successfully!')
-"
-
-if [ $? -eq 0 ]; then
-    echo "✅ Pre-warming completed successfully!"
+from huggingface_hub import snapshot_download
+from app.config import settings
+
+print(f'🤖 Fetching {settings.EMBEDDING_MODEL}...')
+# Skip weight formats neither backend loads (the ONNX backend exports its own)
+snapshot_download(
+    settings.EMBEDDING_MODEL,
+    ignore_patterns=['*.h5', '*.msgpack', '*.ot', 'onnx/*', 'openvino/*']
+)
+print('✅ Model files cached')
+"; then
+    echo "✅ Model files ready"
 else
-    echo "❌ Pre-warming failed"
-    exit 1
+    echo "⚠️  Could not cache model files, the server will fetch them during warm-up"
 fi
 
 # Start the appropriate server
@@ -0,0 +1,42 @@
+"""MicroBatcher coalescing and failure isolation."""
+
+import asyncio
+
+import pytest
+
+from app.utils.batching import MicroBatcher
+
+def _double_unless_bad(items):
+    if "bad" in items:
+        raise ValueError("bad item")
+    return [item * 2 for item in items]
+
+def test_concurrent_items_share_one_batch():
+    batcher = MicroBatcher("test", _double_unless_bad, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(item) for item in ["a", "b", "c"]))
+
+    assert asyncio.run(run()) == ["aa", "bb", "cc"]
+    assert batcher.batches == 1
+
+def test_failing_item_only_fails_its_own_caller():
+    batcher = MicroBatcher("test", _double_unless_bad, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(item) for item in ["a", "bad", "c"]),
+            return_exceptions=True
+        )
+
+    good_a, bad, good_c = asyncio.run(run())
+    assert (good_a, good_c) == ("aa", "cc")
+    assert isinstance(bad, ValueError)
+    assert batcher.retried == 3
+
+def test_single_failing_item_is_not_retried():
+    batcher = MicroBatcher("test", _double_unless_bad, max_batch_size=8, max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        asyncio.run(batcher.submit("bad"))
+    assert batcher.retried == 0
@@ -0,0 +1,74 @@
+"""Streaming course section splitting against the whole-text splitter."""
+
+import pytest
+
+from app.config import settings
+from app.services.data_ingestion import DataIngestionService
+
+FILLER = "This course helps you learn the fundamentals with hands-on projects and mentor support. "
+
+def _catalog(style: str, courses: int = 12) -> str:
+    blocks = []
+    for i in range(1, courses + 1):
+        body = f"{FILLER * 3}\nPrice: ₹{999 + i}\nDuration: {i} weeks"
+        if style == "course":
+            blocks.append(f"Course {i}: Python Track {i}\n{body}")
+        elif style == "numbered":
+            blocks.append(f"{i}. Python Track {i}\n{body}")
+        elif style == "caps":
+            blocks.append(f"\nPYTHON TRACK {i} COURSE\n{body}")
+        else:
+            blocks.append(f"python track {i}\n\n{FILLER * 3}\n\nprice and duration vary")
+    return "Skillyug Catalog\n\n" + "\n\n".join(blocks)
+
+def _paginate(text: str, lines_per_page: int) -> list:
+    lines = text.split("\n")
+    return ["\n".join(lines[i:i + lines_per_page]) for i in range(0, len(lines), lines_per_page)]
+
+@pytest.fixture
+def service():
+    return DataIngestionService()
+
+@pytest.mark.parametrize("style", ["course", "numbered", "caps", "paragraphs"])
+@pytest.mark.parametrize("lines_per_page", [1, 2, 3, 7, 1000])
+def test_sections_match_whole_text_split(service, style, lines_per_page):
+    pages = _paginate(_catalog(style), lines_per_page)
+    expected = service._split_into_courses("\n".join(pages).strip())
+
+    assert list(service._iter_course_sections(pages)) == expected
+
+def test_pattern_priority_is_taken_from_the_probe_window(service, monkeypatch):
+    # The first page only matches the numbered pattern; "Course N:" headings,
+    # which take priority, start on the second page
+    pages = ["Intro\n1. Overview of the catalog", "Course 1: Python\nBody", "Course 2: Java\nBody"]
+    monkeypatch.setattr(settings, "SECTION_PROBE_PAGES", 3)
+
+    assert list(service._iter_course_sections(pages)) == service._split_into_courses("\n".join(pages))
+
+def test_probe_is_capped_without_boundaries(service, monkeypatch):
+    monkeypatch.setattr(settings, "SECTION_PROBE_PAGES", 2)
+    consumed = []
+
+    def pages():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"{FILLER * 3} course {i}\n\n"
+
+    sections = service._iter_course_sections(pages())
+    next(sections)
+    assert len(consumed) <= 3
+
+def test_closing_courses_closes_the_page_source(service):
+    closed = []
+
+    def pages():
+        try:
+            for i in range(1, 100):
+                yield f"Course {i}: Track {i}\n{FILLER}"
+        finally:
+            closed.append(True)
+
+    courses = service.iter_courses(pages())
+    next(courses)
+    courses.close()
+    assert closed == [True]
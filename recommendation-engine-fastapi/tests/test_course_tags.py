@@ -0,0 +1,23 @@
+"""Tags generated for parsed catalog sections.
+
+Tags are part of every course's content hash, so a change here re-embeds the
+whole catalog on the next sync; these pin the substring matching they have
+always used.
+"""
+
+from app.services.data_ingestion import DataIngestionService
+
+def _tags(section: str) -> list:
+    return DataIngestionService()._extract_course_info(section, 0)['tags']
+
+def test_keywords_match_as_substrings():
+    assert _tags("Course 1: JavaScript Essentials\nBuild REST APIs and React Native apps") == [
+        'javascript', 'java', 'react', 'api', 'rest'
+    ]
+
+def test_tags_keep_keyword_order_and_limit():
+    section = (
+        "Course 2: DevOps with Docker\nKubernetes, AWS, Azure, Git, SQL, MongoDB, Python "
+        "and Flask for backend databases"
+    )
+    assert _tags(section) == ['python', 'flask', 'sql', 'mongodb', 'aws', 'azure', 'docker', 'kubernetes']
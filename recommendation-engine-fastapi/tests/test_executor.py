@@ -0,0 +1,22 @@
+"""BoundedExecutor timeouts."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.executor import BoundedExecutor
+
+def test_explicit_zero_timeout_is_not_replaced_by_the_default():
+    executor = BoundedExecutor("test", max_workers=1, default_timeout=5.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(executor.run(time.sleep, 0.2, timeout=0))
+    assert executor.timeouts == 1
+
+def test_default_timeout_applies_when_none_is_given():
+    executor = BoundedExecutor("test", max_workers=1, default_timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(executor.run(time.sleep, 0.2))
+    assert executor.timeouts == 1
@@ -0,0 +1,49 @@
+"""Confidence boosts applied when ranking search results."""
+
+from app.models.recommendation import Course, UserIntent
+from app.services.recommendation_service import RecommendationService
+
+def _course(**overrides) -> Course:
+    fields = {
+        'id': 'python-data-science',
+        'title': 'Python for Analysts',
+        'description': 'Analyse datasets with pandas',
+        'level': 'intermediate',
+        'category': 'Data Science',
+        'tags': ['python', 'pandas'],
+        'price': 1299.0,
+        'instructor': 'Skillyug'
+    }
+    fields.update(overrides)
+    return Course(**fields)
+
+def test_semantic_category_raises_confidence():
+    service = RecommendationService()
+    course = _course()
+
+    without, _ = service._calculate_match_details(course, UserIntent(level='beginner'), 0.6)
+    with_category, _ = service._calculate_match_details(
+        course, UserIntent(level='beginner', categories=['Data Science']), 0.6
+    )
+
+    assert with_category > without
+
+def test_category_matching_a_tag_counts_once_with_the_same_topic():
+    service = RecommendationService()
+    course = _course(category='Programming', tags=['python', 'data science'])
+
+    once, _ = service._calculate_match_details(course, UserIntent(categories=['Data Science']), 0.5)
+    both, _ = service._calculate_match_details(
+        course, UserIntent(topics=['data science'], categories=['Data Science']), 0.5
+    )
+
+    assert once == both == 0.6
+
+def test_unrelated_category_does_not_change_confidence():
+    service = RecommendationService()
+    course = _course()
+
+    without, _ = service._calculate_match_details(course, UserIntent(), 0.6)
+    with_category, _ = service._calculate_match_details(course, UserIntent(categories=['Marketing']), 0.6)
+
+    assert with_category == without